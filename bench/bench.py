@@ -0,0 +1,210 @@
+#!/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Benchmarks of the manpagesgui rendering and search stages.
+# Builds a fixture corpus (the pages of bench/corpus plus generated large,
+# table heavy and link heavy pages), times each stage separately against it
+# with the stand-in man and groff of bench/bin, writes the median times as
+# JSON and compares them with bench/baseline.json: a stage slower than the
+# baseline beyond the tolerance makes the run exit with status 1. Stages are
+# compared as ratios to a calibration workload timed in the same run (Python
+# code, compression and a process start), so that the baseline holds no
+# absolute times of the machine that recorded it. The legacy
+# stages replay the shell pipelines a page load spawned before the single
+# man -aw and groff run, for a before and after comparison.
+
+from argparse import ArgumentParser
+from gzip import GzipFile
+from json import dump, dumps, load
+from os import environ, makedirs, path, pathsep, scandir, unlink
+from platform import python_version
+from random import Random
+from shutil import copy, rmtree, which
+from subprocess import DEVNULL, PIPE, Popen
+from statistics import median
+from sys import argv, executable, exit, stderr, path as syspath
+from tempfile import mkdtemp
+from time import perf_counter
+from zlib import compress
+
+BENCH= path.dirname(path.realpath(__file__))
+WORDS= [ "buffer", "regular", "expression", "descriptor", "signal", "process", "terminal", "locale", "socket", "thread", "memory", "option", "format", "stream", "device", "library", "kernel", "session", "pattern", "archive" ]
+
+def words(random, count):
+    return " ".join(random.choice(WORDS) for x in range(count))
+
+def page(name, section, description, body):
+    return ".TH %s %s \"2015-04-10\" \"manpagesgui\" \"Benchmark fixtures\"\n.SH NAME\n%s \\- %s\n%s" % (name.upper(), section, name, description, body)
+
+def largePage(random):
+    body= list()
+    for i in range(40):
+        body.append(".SH SECTION%d" % i)
+        for j in range(25):
+            body.extend([ ".PP", "%s \\fB%s\\fR $BENCH_%s %s see https://example.org/%s/%d.html or bench%d@example.org." % (words(random, 12), random.choice(WORDS), random.choice(WORDS).upper(), words(random, 8), random.choice(WORDS), j, j), ".BR bench%04d (1)" % random.randrange(400) ])
+    return page("benchlarge", 1, "very large benchmark page", "\n".join(body))
+
+def tablePage(random):
+    body= [ ".SH DESCRIPTION" ]
+    for i in range(60):
+        body.extend([ ".PP", "Table %d %s" % (i, words(random, 10)), ".TS", "allbox tab(\t);", "l l l.", "\\fBName\\fR\t\\fBValue\\fR\t\\fBMeaning\\fR" ])
+        body.extend("%s%d\t%d\t%s" % (random.choice(WORDS), j, random.randrange(1000), words(random, 3)) for j in range(10))
+        body.append(".TE")
+    return "'\\\" t\n%s" % page("benchtables", 1, "benchmark page made of many tables", "\n".join(body))
+
+def linkPage(random):
+    body= [ ".SH DESCRIPTION" ] + [ ".BR bench%04d (%d)," % (random.randrange(400), random.choice([ 1, 3 ])) for x in range(2000) ]
+    return page("benchxref", 1, "benchmark page made of cross references", "\n".join(body + [ ".SH SEE ALSO", ".BR benchbasic (1)" ]))
+
+def corpus(directory, pages):
+    random= Random(1504)
+    for dir in [ x for x in scandir(path.join(BENCH, "corpus")) if x.is_dir() ]:
+        makedirs(path.join(directory, dir.name), exist_ok= True)
+        for fn in scandir(dir.path):
+            copy(fn.path, path.join(directory, dir.name))
+    for name, source in [ [ "benchlarge.1", largePage(random) ], [ "benchtables.1", tablePage(random) ], [ "benchxref.1", linkPage(random) ] ]:
+        with open(path.join(directory, "man1", name), "w", encoding= "utf-8") as f:
+            f.write(source)
+    for i in range(pages):
+        section= 3 if i % 4 == 3 else 1
+        source= page("bench%04d" % i, section, "%s filler page" % words(random, 4), ".SH DESCRIPTION\n%s\n.SH SEE ALSO\n.BR bench%04d (1)\n" % ("\n.PP\n".join(words(random, 30) for x in range(12)), random.randrange(pages)))
+        with (GzipFile if i % 2 else open)(path.join(directory, "man%d" % section, "bench%04d.%d%s" % (i, section, ".gz" if i % 2 else "")), "wb") as f:
+            f.write(source.encode("utf-8"))
+
+def measure(stages, name, fn, repeat):
+    fn()
+    times= list()
+    for x in range(repeat):
+        start= perf_counter()
+        fn()
+        times.append((perf_counter() - start) * 1000)
+    stages[name]= round(median(times), 3)
+    print("%-28s %10.3f ms" % (name, stages[name]), file= stderr, flush= True)
+
+def calibrate(repeat):
+    stages, data, random= dict(), " ".join(WORDS).encode("utf-8") * 4000, Random(1504)
+    def work():
+        compress(data)
+        sorted(random.random() for x in range(50000))
+        Popen([ executable, "-c", "" ]).wait()
+    measure(stages, "calibration", work, repeat)
+    return stages["calibration"]
+
+def compare(ratios, baseline, tolerance, floor):
+    regressions= list()
+    for name in sorted(x for x in ratios if x not in baseline):
+        print("%s: no baseline" % name, file= stderr)
+    for name, reference in sorted(baseline.items()):
+        if name in ratios and ratios[name] > reference * (1 + tolerance / 100) and ratios[name] - reference > floor:
+            regressions.append(name)
+            print("%s: %.4f x calibration, baseline %.4f (+%.0f%%)" % (name, ratios[name], reference, (ratios[name] / max(reference, 0.0001) - 1) * 100), file= stderr)
+    return regressions
+
+def legacyLoad(cmd, page, tables):
+    for option in [ "-w", "-f", "-Hcat --nh" ] + ([ "-Pcat --nh" ] if tables else list()):
+        Popen("%s %s %s" % (cmd, option, page), stdout= PIPE, stderr= DEVNULL, universal_newlines= True, shell= True, start_new_session= True).communicate()
+
+def webView(css):
+    from PyQt5.QtCore import QByteArray, QEventLoop, QUrl
+    try:
+        from PyQt5.QtWebKitWidgets import QWebView
+        view, loop= QWebView(), QEventLoop()
+        view.settings().setUserStyleSheetUrl(QUrl("data:text/css;charset=utf-8;base64,%s" % str(QByteArray(css.encode("utf-8")).toBase64(), encoding= "utf8")))
+        view.loadFinished.connect(loop.quit)
+    except (AttributeError, ImportError) as e:
+        print("setHtml large: skipped, QtWebKit unusable (%s)" % e, file= stderr, flush= True)
+        return None
+    return [ view, loop ]
+
+def run(m, directory, repeat):
+    from PyQt5.QtWidgets import QApplication
+    stages, app= dict(), QApplication([ "manpagesgui" ])
+    m.index, m.whatis= m.FullTextIndex(), m.WhatisIndex()
+    m.catalog= m.Catalog()
+    cmd= [ m.namespace.man_command, "-D", "-M%s" % directory ]
+    large, tables, xref= [ path.join(directory, "man1", x) for x in [ "benchlarge.1", "benchtables.1", "benchxref.1" ] ]
+    source= [ m.readSource(x)[1] for x in [ large, tables, xref ] ]
+    html= [ m.man(m.groff("html", x), m.ManPagesGUI.POPEN, Input= x, cwd= directory)[1] for x in source ]
+    css, post= m.styleSheet(), m.postProcess(html[0])
+    measure(stages, "man -aw", lambda: m.man("1 benchlarge", m.ManPagesGUI.DEFAULTSECTION), repeat)
+    measure(stages, "groff html", lambda: m.man(m.groff("html", source[0]), m.ManPagesGUI.POPEN, Input= source[0], cwd= directory), repeat)
+    measure(stages, "postProcess large", lambda: m.postProcess(html[0]), repeat)
+    measure(stages, "postProcess links", lambda: m.postProcess(html[2]), repeat)
+    measure(stages, "tbl tables", lambda: m.tblTables(source[1]), repeat)
+    measure(stages, "styledPage export", lambda: m.styledPage(post, css), repeat)
+    measure(stages, "render tables", lambda: m.render(tables, cmd), repeat)
+    for name, page, table in [ [ "basic", "benchbasic", False ], [ "tables", "benchtables", True ] ]:
+        measure(stages, "page load %s" % name, lambda: m.man(m.man(page, m.ManPagesGUI.DEFAULTSECTION)[0][1], m.ManPagesGUI.CONTENTSECTION), repeat)
+        measure(stages, "page load %s legacy" % name, lambda: legacyLoad(" ".join(cmd), page, table), repeat)
+    web= webView(css)
+    if web:
+        measure(stages, "setHtml large", lambda: [ web[0].setHtml(post), web[1].exec_() ], repeat)
+    measure(stages, "apropos load", lambda: m.WhatisIndex().load(), max(repeat // 4, 1))
+    measure(stages, "apropos substring", lambda: m.whatis.search("filler", 1, m.WhatisIndex.SUBSTRING), repeat)
+    measure(stages, "apropos regex", lambda: m.whatis.search(r"^bench\d+3", 0, m.WhatisIndex.REGEX), repeat)
+    files= list(m.manFiles(m.manRoots()))
+    measure(stages, "content scan", lambda: m.grepPages(files, "regular expression", False), repeat)
+    def build():
+        m.index.prepare()
+        for ext in [ ".postings", ".forward" ]:
+            if path.isfile(m.index.fn + ext):
+                unlink(m.index.fn + ext)
+        m.index.update()
+    measure(stages, "content index build", build, max(repeat // 4, 1))
+    measure(stages, "content index term", lambda: m.index.search("descriptor"), repeat)
+    measure(stages, "content index phrase", lambda: m.index.search("regular expression"), repeat)
+    measure(stages, "content index regex", lambda: m.index.search(r"^bench00\d\d$", True), repeat)
+    m.graph= m.LinkGraph()
+    def links():
+        m.graph.prepare()
+        for ext in [ ".graph", ".refs" ]:
+            if path.isfile(m.graph.fn + ext):
+                unlink(m.graph.fn + ext)
+        m.graph.update()
+    measure(stages, "link graph build", links, max(repeat // 4, 1))
+    measure(stages, "link graph backlinks", lambda: m.graph.links("benchbasic(1)", True), repeat)
+    if web:
+        web[0].close()
+    app.quit()
+    return stages
+
+if __name__ == "__main__":
+    parser= ArgumentParser(description= "manpagesgui benchmarks")
+    parser.add_argument("--output", "-o", action= "store", default= None, help= "write results as JSON to file instead of standard output")
+    parser.add_argument("--baseline", "-b", action= "store", default= path.join(BENCH, "baseline.json"), help= "baseline file (default: %(default)s)")
+    parser.add_argument("--update-baseline", "-u", action= "store_true", help= "store results as the new baseline")
+    parser.add_argument("--tolerance", "-t", type= float, action= "store", default= 50, help= "allowed slowdown in percent (default: %(default)s)")
+    parser.add_argument("--floor", "-f", type= float, action= "store", default= 2, help= "slowdown in ms, at the speed of the calibration, always allowed (default: %(default)s)")
+    parser.add_argument("--repeat", "-r", type= int, action= "store", default= 9, help= "runs per stage (default: %(default)s)")
+    parser.add_argument("--pages", "-p", type= int, action= "store", default= 400, help= "generated filler pages (default: %(default)s)")
+    parser.add_argument("--system-groff", "-g", action= "store_true", help= "use installed groff instead of the stand-in")
+    options= parser.parse_args()
+    work= mkdtemp(prefix= "manpagesgui-bench-")
+    try:
+        directory= path.join(work, "man")
+        corpus(directory, options.pages)
+        environ.update({ "XDG_CACHE_HOME": path.join(work, "cache"), "QT_QPA_PLATFORM": environ.get("QT_QPA_PLATFORM", "offscreen"), "LANG": "C" })
+        standin= not options.system_groff or not which("groff")
+        if standin:
+            environ["PATH"]= "%s%s%s" % (path.join(BENCH, "bin"), pathsep, environ["PATH"])
+        syspath.insert(0, path.dirname(BENCH))
+        import manpagesgui as m
+        argv[1:]= [ "-M", path.join(BENCH, "bin", "man"), "-D", directory, "-cs", "0", "-nl" ]
+        m.namespace, m.cache= m.parsing()[0], None
+        calibration= calibrate(options.repeat)
+        stages= run(m, directory, options.repeat)
+        results= { "environment": { "python": python_version(), "groff": "stand-in" if standin else "system", "webkit": "setHtml large" in stages, "pages": options.pages, "repeat": options.repeat }, "calibration": calibration, "stages": stages, "ratios": dict((x, round(y / calibration, 4)) for x, y in stages.items()) }
+    finally:
+        rmtree(work, ignore_errors= True)
+    if options.output:
+        with open(options.output, "w") as f:
+            dump(results, f, indent= 2, sort_keys= True)
+    else:
+        print(dumps(results, indent= 2, sort_keys= True))
+    if options.update_baseline:
+        with open(options.baseline, "w") as f:
+            dump({ "environment": results["environment"], "ratios": results["ratios"] }, f, indent= 2, sort_keys= True)
+            f.write("\n")
+    elif path.isfile(options.baseline):
+        with open(options.baseline) as f:
+            exit(1 if len(compare(results["ratios"], load(f)["ratios"], options.tolerance, options.floor / calibration)) else 0)
@@ -0,0 +1,89 @@
+#!/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Golden output checks of the manpagesgui rendering passes.
+# bench/golden holds groff -Thtml output (*.groff.html) of the corpus pages and
+# of hand written corner cases, with the HTML postProcess must produce from it
+# with links enabled (*.html) and with URL and e-mail links disabled
+# (*.nolinks.html). The expected files were produced by the regex chain
+# postProcess replaced. It also holds tbl sources (*.tbl) covering column
+# spans, T{ T} blocks, .T& and vertical spans, with the tables tblTables must
+# build from them (*.tbl.html, one table per line), checked by hand. The
+# export check renders a small manual with a section 3p page and checks the
+# links between the exported files. Any difference makes the run exit with
+# status 1; --update rewrites the expected files from the current code.
+
+from argparse import ArgumentParser
+from difflib import unified_diff
+from glob import glob
+from os import environ, makedirs, path, pathsep
+from shutil import rmtree
+from sys import argv, exit, stderr, path as syspath
+from tempfile import mkdtemp
+
+BENCH= path.dirname(path.realpath(__file__))
+GOLDEN= path.join(BENCH, "golden")
+
+def check(fn, result, update):
+    if update:
+        with open(fn, "w", encoding= "utf-8") as f:
+            f.write(result)
+        return True
+    with open(fn, encoding= "utf-8") as f:
+        expected= f.read()
+    if expected != result:
+        stderr.writelines(unified_diff(expected.splitlines(True), result.splitlines(True), fn, "result"))
+        return False
+    return True
+
+def postProcessed(m, update):
+    failed= list()
+    for flags, suffix in [ [ list(), "" ], [ [ "-nu", "-ne" ], ".nolinks" ] ]:
+        argv[1:]= [ "-M", path.join(BENCH, "bin", "man") ] + flags
+        m.namespace= m.parsing()[0]
+        for fn in sorted(glob(path.join(GOLDEN, "*.groff.html"))):
+            with open(fn, encoding= "utf-8") as f:
+                source= f.read()
+            if not check(fn.replace(".groff.html", "%s.html" % suffix), m.postProcess(source), update):
+                failed.append("postProcess %s%s" % (path.basename(fn), suffix))
+    return failed
+
+def tables(m, update):
+    failed= list()
+    for fn in sorted(glob(path.join(GOLDEN, "*.tbl"))):
+        with open(fn, "rb") as f:
+            source= f.read()
+        if not check("%s.html" % fn, "".join("%s\n" % x for x in m.tblTables(source)[1]), update):
+            failed.append("tblTables %s" % path.basename(fn))
+    return failed
+
+def exported(m):
+    failed, work= list(), mkdtemp(prefix= "manpagesgui-golden-")
+    try:
+        for fn, source in [ [ "man1/user.1", ".TH USER 1\n.SH NAME\nuser \\- links to other sections\n.SH SEE ALSO\n.BR foo (3p)\n.BR foo (3)\n.BR user (1)\n.BR missing (1)\n" ], [ "man3p/foo.3p", ".TH FOO 3p\n.SH NAME\nfoo \\- POSIX page\n.SH SEE ALSO\n.BR user (1)\n" ] ]:
+            makedirs(path.dirname(path.join(work, "man", fn)), exist_ok= True)
+            with open(path.join(work, "man", fn), "w", encoding= "utf-8") as f:
+                f.write(source)
+        argv[1:]= [ "-M", path.join(BENCH, "bin", "man"), "-D", path.join(work, "man"), "-cs", "0" ]
+        m.namespace, m.cache= m.parsing()[0], None
+        m.export(path.join(work, "html"), list(), [ path.join(work, "man") ])
+        for fn, links in [ [ "man1/user.1.html", [ "<a href='../man3p/foo.3p.html'>foo(3p)</a>", "<a href='../man3p/foo.3p.html'>foo(3)</a>", "<a href='user.1.html'>user(1)</a>", "<b>missing</b>(1)" ] ], [ "man3p/foo.3p.html", [ "<a href='../man1/user.1.html'>user(1)</a>" ] ] ]:
+            with open(path.join(work, "html", fn), encoding= "utf-8") as f:
+                html= f.read()
+            failed.extend("export %s: %s" % (fn, x) for x in links if x not in html)
+    finally:
+        rmtree(work, ignore_errors= True)
+    return failed
+
+if __name__ == "__main__":
+    parser= ArgumentParser(description= "manpagesgui golden output checks")
+    parser.add_argument("--update", "-u", action= "store_true", help= "rewrite the expected files from the current code")
+    options= parser.parse_args()
+    environ["PATH"]= "%s%s%s" % (path.join(BENCH, "bin"), pathsep, environ["PATH"])
+    syspath.insert(0, path.dirname(BENCH))
+    import manpagesgui as m
+    failed= postProcessed(m, options.update) + tables(m, options.update) + exported(m)
+    for name in failed:
+        print("%s: mismatch" % name, file= stderr)
+    print("%s: %d" % ("updated" if options.update else "mismatches", len(failed)))
+    exit(1 if len(failed) else 0)
@@ -18,25 +18,39 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 from argparse import ArgumentParser, ArgumentTypeError
+from array import array
+from bisect import bisect_left, bisect_right
+from bz2 import BZ2File
+from collections import OrderedDict
+from concurrent.futures import as_completed, ProcessPoolExecutor, ThreadPoolExecutor
 from functools import partial
 from gettext import bindtextdomain, gettext, textdomain
-from glob import glob
-from os import access, F_OK, path, sep, W_OK
+from hashlib import sha1
+from html import escape as htmlEscape
+from gzip import GzipFile
+from importlib import import_module
+from importlib.util import find_spec
+from json import dumps, loads
+from lzma import LZMAFile
+from multiprocessing import cpu_count, get_context
+from os import access, environ, F_OK, fdopen, getloadavg, getuid, killpg, makedirs, nice, path, replace, scandir, sep, stat, sysconf, unlink, utime, W_OK
 from random import randrange
-from re import compile, DOTALL, findall, IGNORECASE, match, MULTILINE, sub
+from re import compile, DOTALL, escape, IGNORECASE, match, MULTILINE, sub
 from shutil import which
-from subprocess import DEVNULL, PIPE, Popen
+from signal import SIGKILL, SIGTERM
+from subprocess import DEVNULL, PIPE, Popen, TimeoutExpired
+from sys import getsizeof, stderr
+from tempfile import mkstemp, TemporaryFile
 from textwrap import dedent
-from PyQt5.QtCore import QBuffer, QByteArray, QSettings, Qt, QUrl
+from threading import BoundedSemaphore, Event, Lock
+from time import time, time_ns
+from zlib import compress, decompress
+from PyQt5.QtCore import pyqtSignal, QAbstractTableModel, QByteArray, QFileSystemWatcher, QModelIndex, QObject, QSettings, QStringListModel, Qt, QTimer, QUrl
 from PyQt5.QtGui import QCursor, QDesktopServices, QIcon, QPixmap
-from PyQt5.QtWidgets import QAbstractItemView, QAction, QApplication, QButtonGroup, QCheckBox, QComboBox, QDialog, QGroupBox, QGridLayout, QHBoxLayout, QLabel, QLayout, QLineEdit, QMenu, QMessageBox, QPushButton, QRadioButton, QSizePolicy, QStyle, QTableWidget, QTableWidgetItem, QTextBrowser, QVBoxLayout, QWidget
+from PyQt5.QtNetwork import QLocalServer, QLocalSocket
+from PyQt5.QtWidgets import QAbstractItemView, QAction, QApplication, QButtonGroup, QCheckBox, QComboBox, QCompleter, QDialog, QGroupBox, QGridLayout, QHBoxLayout, QHeaderView, QLabel, QLayout, QLineEdit, QMenu, QMessageBox, QProgressDialog, QPushButton, QRadioButton, QSizePolicy, QStyle, QTableView, QTextBrowser, QVBoxLayout, QWidget
 from PyQt5.QtWebKitWidgets import QWebPage, QWebView
-try:
-    from lxml import etree as ET
-except:
-    LXML= False
-else:
-    LXML= True
+LXML= find_spec("lxml") is not None
 
 PROJECT_NAME= "manPagesGui"
 PROJECT_VERSION= "1.2.1"
@@ -44,6 +58,9 @@ PROJECT_RELEASE_DATE= "2015-04-10"
 PROJECT_TEAM= "ElMoribond"
 PROJECT_EMAIL= "elmoribond@gmail.com"
 PROJECT_URL= "https://github.com/ElMoribond/manpagesgui"
+STARTED= time()
+RENDER_FORMAT= 2
+COMPRESSIONS= { ".gz": GzipFile, ".bz2": BZ2File, ".xz": LZMAFile, ".lzma": LZMAFile, ".Z": None, ".zst": None }
 
 bindtextdomain(PROJECT_NAME.lower(), path.join(path.dirname(path.realpath(__file__)), "i18n"))
 textdomain(PROJECT_NAME.lower())
@@ -87,8 +104,8 @@ class MLabel(QLabel):
         super().leaveEvent(event)
 
 class ManPagesGUI(QDialog):
-    POPEN, DEFAULTSECTION, ALLSECTIONS, CONTENTSECTION, FINDSHORT, FINDFULL, FINDREGEX= range(0, 7)
-    OpenBox, resultDialog, manpagesHover, pagesError, pages, manScheme, rawScheme= 0, None, False, list(), list(), "manpage", "raw"
+    POPEN, DEFAULTSECTION, CONTENTSECTION, FINDSHORT, FINDREGEX= range(0, 5)
+    OpenBox, resultDialog, manpagesHover, pagesError, manScheme= 0, None, False, list(), "manpage"
     randomPage, errorOccurred, notFound= gettext("Random Page"), gettext("An error occurred"), gettext("Not Found")
 
     class AboutDialog(MDialog):
@@ -139,7 +156,11 @@ class ManPagesGUI(QDialog):
             super().__init__()
             self.setContextMenuPolicy(Qt.CustomContextMenu)
             self.customContextMenuRequested.connect(self.openContextMenu)
-            self.info= self.Label(self)
+            self.info, self.completer, self.pending= self.Label(self), QCompleter(QStringListModel(self), self), None
+            self.completer.setWidget(self)
+            self.completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+            self.completer.activated[str].connect(self.setText)
+            self.textEdited.connect(self.complete)
 
         def focusOutEvent(self, event):
             if ManPagesGUI.self.buttonExtra.hasFocus():
@@ -155,9 +176,28 @@ class ManPagesGUI(QDialog):
             super().resizeEvent(event)
 
         def keyPressEvent(self, event):
-            if not ManPagesGUI.manpagesHover or not ManPagesGUI.self.manpages.pressedKey(event):
+            if event.key() == Qt.Key_Escape and len(ManPagesGUI.self.manpages.loader.jobs):
+                ManPagesGUI.self.manpages.loader.cancel()
+            elif not ManPagesGUI.manpagesHover or not ManPagesGUI.self.manpages.pressedKey(event):
                 super().keyPressEvent(event)
 
+        def complete(self, text):
+            found, completions= PAGETOKEN.search(text), list()
+            if not catalog.loaded:
+                if self.pending is None or self.pending.done():
+                    self.pending= ManPagesGUI.self.manpages.loader.pool.submit(catalog.load)
+            elif found:
+                if found.group(1):
+                    for label in catalog.complete(found.group(2), found.group(1)):
+                        completions.append("%s%s %s" % (text[:found.start(1)], label[label.rfind("(") + 1:-1], label[:label.rfind("(")]))
+                else:
+                    completions= [ "%s%s" % (text[:found.start(2)], label) for label in catalog.complete(found.group(2)) ]
+            self.completer.model().setStringList(completions)
+            if len(completions):
+                self.completer.complete()
+            else:
+                self.completer.popup().hide()
+
         def openContextMenu(self, point):
             contextMenu= self.createStandardContextMenu()
             contextMenu.addSeparator()
@@ -166,32 +206,178 @@ class ManPagesGUI(QDialog):
 
     class ManPageZone(QWebView):
 
+        class Loader(QObject):
+            loaded= pyqtSignal(int, str, bool, object)
+
+            class Batch:
+
+                def __init__(self, pages, option):
+                    self.pages, self.option, self.results, self.next, self.last, self.superseded= pages, option, [ None ] * len(pages), 0, None, False
+
+            class Job:
+
+                def __init__(self, ticket, nice= False):
+                    self.ticket, self.calls, self.cancelled, self.nice, self.start, self.timings= ticket, list(), False, nice, time(), OrderedDict()
+
+                def timed(self, stage, start):
+                    self.timings[stage]= self.timings.get(stage, 0) + time() - start
+
+                def register(self, call):
+                    self.calls.append(call)
+                    if self.cancelled:
+                        broker.cancel(call, self)
+
+                def kill(self):
+                    self.cancelled= True
+                    for call in list(self.calls):
+                        broker.cancel(call, self)
+
+            # Init de Loader
+            def __init__(self, zone):
+                super().__init__()
+                self.zone, self.pool, self.jobs, self.ticket, self.busy, self.batch= zone, ThreadPoolExecutor(max_workers= 4), dict(), 0, False, None
+                self.loaded.connect(self.finished)
+
+            def load(self, pages, option):
+                known, requested= set(ManPagesGUI.self.pagesList.itemText(x).lower() for x in range(ManPagesGUI.self.pagesList.count())), OrderedDict()
+                for page in pages:
+                    key= " ".join(parsePages(page)[:1]).lower()
+                    if len(key) and key not in requested and (len(pages) == 1 or sub(r"(\S+) (.+)", r"\2(\1)", key) not in known):
+                        requested[key]= page
+                batch= self.Batch(list(requested.values()), option)
+                if len(batch.pages):
+                    self.supersede()
+                    self.batch= batch
+                self.zone.prefetcher.cancel()
+                for i, page in enumerate(batch.pages):
+                    job, result= self.Job(self.ticket), self.zone.prefetcher.take(page)
+                    if result is None:
+                        self.jobs[job]= self.pool.submit(self.fetch, job, page, option, known, batch, i)
+                    else:
+                        self.loaded.emit(job.ticket, page, option, [ job, result, batch, i ])
+                self.actualizeCursor()
+
+            def supersede(self):
+                if self.batch:
+                    self.batch.superseded= True
+
+            def fetch(self, job, page, option, known, batch, i):
+                self.loaded.emit(job.ticket, page, option, [ job, self.resolve(job, page, known), batch, i ])
+
+            @staticmethod
+            def resolve(job, page, known):
+                try:
+                    start= time()
+                    found= man(parsePages(page)[0], ManPagesGUI.DEFAULTSECTION, job= job)
+                    job.timed("man -w", start)
+                    if type(found[0]) != type(list()):
+                        return [ found, None, None ]
+                    elif found[0][0].lower() in known:
+                        return [ found[0], None, None ]
+                    sections= catalog.load().sections(found[0][0][:found[0][0].rfind("(")])
+                    return [ found[0], sections if found[0][0] in sections else list(OrderedDict.fromkeys(x[0] for x in found)), man(found[0][1], ManPagesGUI.CONTENTSECTION, job= job) ]
+                except:
+                    return [ [ -2 ], None, None ]
+
+            def finished(self, ticket, page, option, result):
+                job, result, batch, i= result
+                self.jobs.pop(job, None)
+                if ticket == self.ticket and not job.cancelled:
+                    batch.results[i]= [ page, result, job ]
+                    while batch.next < len(batch.pages) and batch.results[batch.next] is not None:
+                        page, result, job= batch.results[batch.next]
+                        self.zone.timing= [ job.start, job.timings ]
+                        self.zone.pageLoaded(page, option if len(batch.pages) == 1 and not batch.superseded else False, *result, show= not batch.superseded)
+                        if self.zone.timing is not None:
+                            profiler.record("page", page, self.zone.timing[1])
+                            self.zone.timing= None
+                        batch.last, batch.next= result[0][0] if type(result[0][0]) == type(str()) else batch.last, batch.next + 1
+                    if batch.next == len(batch.pages) > 1 and option and not batch.superseded and batch.last is not None:
+                        self.zone.openPage(ManPagesGUI.self.pagesList.findText(batch.last, Qt.MatchFixedString))
+                self.actualizeCursor()
+
+            def cancel(self):
+                self.ticket+= 1
+                for job, future in list(self.jobs.items()):
+                    job.kill()
+                    if future.cancel():
+                        self.jobs.pop(job)
+                self.actualizeCursor()
+
+            def actualizeCursor(self):
+                if len(self.jobs) and not self.busy:
+                    QApplication.setOverrideCursor(QCursor(Qt.BusyCursor))
+                elif not len(self.jobs) and self.busy:
+                    QApplication.restoreOverrideCursor()
+                self.busy= True if len(self.jobs) else False
+
+        class Prefetcher(QObject):
+            fetched= pyqtSignal(int, str, object)
+
+            def __init__(self):
+                super().__init__()
+                self.pool, self.store, self.size, self.jobs, self.ticket= ThreadPoolExecutor(max_workers= 1), OrderedDict(), 0, dict(), 0
+                self.fetched.connect(self.finished)
+
+            def start(self, html):
+                self.cancel()
+                if int(namespace.prefetch):
+                    i, known= html.find("<h2>SEE ALSO"), set(ManPagesGUI.self.pagesList.itemText(x).lower() for x in range(ManPagesGUI.self.pagesList.count()))
+                    links= MANPAGEHREF.findall(html[i:]) + MANPAGEHREF.findall(html[:i]) if i > -1 else MANPAGEHREF.findall(html)
+                    pages= [ x for x in OrderedDict.fromkeys("%s %s" % (x[1], x[0]) for x in links) if ("%s(%s)" % (x.split(" ", 1)[1], x.split(" ", 1)[0])).lower() not in known and x.lower() not in self.store ]
+                    for page in pages[:int(namespace.prefetch)]:
+                        job= ManPagesGUI.ManPageZone.Loader.Job(self.ticket, True)
+                        self.jobs[job]= self.pool.submit(self.fetch, job, page, known)
+
+            def fetch(self, job, page, known):
+                if job.cancelled or getloadavg()[0] * 100 > int(namespace.prefetch_cpu) * cpu_count():
+                    return
+                self.fetched.emit(job.ticket, page, [ job, ManPagesGUI.ManPageZone.Loader.resolve(job, page, known) ])
+
+            def finished(self, ticket, page, result):
+                self.jobs.pop(result[0], None)
+                if ticket == self.ticket and not result[0].cancelled and type(result[1][2]) == type(list()) and type(result[1][2][0]) == type(str()):
+                    self.store[page.lower()]= [ result[1], getsizeof(result[1][2][0]) ]
+                    self.size+= self.store[page.lower()][1]
+                    while self.size > int(namespace.prefetch_memory) * 1024 * 1024:
+                        self.size-= self.store.popitem(last= False)[1][1]
+
+            def discard(self, files):
+                for page, entry in list(self.store.items()):
+                    if entry[0][0][1] in files:
+                        self.size-= self.store.pop(page)[1]
+
+            def take(self, page):
+                page= " ".join(parsePages(page)[:1]).lower()
+                if page in self.store:
+                    self.size-= self.store[page][1]
+                    return self.store.pop(page)[0]
+                return None
+
+            def cancel(self):
+                self.ticket+= 1
+                for job, future in list(self.jobs.items()):
+                    job.kill()
+                    future.cancel()
+                self.jobs.clear()
+
+        # Init de ManPageZone
         def __init__(self):
             super().__init__()
+            self.loader, self.prefetcher, self.timing, self.layout, self.sections= self.Loader(self), self.Prefetcher(), None, None, list()
             self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
             self.setContextMenuPolicy(Qt.CustomContextMenu)
             self.customContextMenuRequested.connect(self.openContextMenu)
             self.page().setLinkDelegationPolicy(QWebPage.DelegateAllLinks)
             self.linkClicked.connect(self.openPage)
+            self.loadFinished.connect(self.displayed)
             ManPagesGUI.self.command.returnPressed.connect(partial(self.openPage, ManPagesGUI.self.command))
             ManPagesGUI.self.pagesList.currentIndexChanged[int].connect(partial(self.openPage, -2))
             if not namespace.no_proposal:
                 ManPagesGUI.self.pagesOther.currentIndexChanged[int].connect(partial(self.openPage, -3))
             ManPagesGUI.self.buttonPrevious.clicked.connect(partial(self.openPage, False))
             ManPagesGUI.self.buttonNext.clicked.connect(partial(self.openPage, True))
-            self.raw, ba, img= False, QByteArray(), self.style().standardIcon(QStyle.SP_MessageBoxWarning)
-            img.pixmap(48, 48, QIcon.Normal, QIcon.On).save(QBuffer(ba), "PNG")
-            self.css= "%s%s" % ("" if namespace.theme_color else """
-                body { color: """ + namespace.color + """; background-color: """ + namespace.background + """ }
-                a:link { color: """ + namespace.link_color + """; background-color: """ + namespace.link_background + """ }
-                h2 { color: """ + namespace.section_color + """; background-color: """ + namespace.section_background + """}
-                envar { color: """ + namespace.envar_color + """; background-color: """ + namespace.envar_background + """}
-                b { color: """ + namespace.bold_color + """; background-color: """ + namespace.bold_background + """}
-                i { color: """ + namespace.italic_color + """; background-color: """ + namespace.italic_background + """}
-                table.add { border-collapse: collapse; margin: 1em auto; }
-                td.add, th.add { border: 1px solid """ + namespace.color + """; padding: 3px; }\n""", """
-                .rawlink { height: 48px; width: 48px; background-image: url(data:image/png;base64,""" + str(ba.toBase64(), encoding= "utf8") + """); }
-                p, pre, table { margin-top: 0; margin-bottom: 0; vertical-align: top }""")
+            self.applyTheme()
 
         def enterEvent(self, event):
             ManPagesGUI.manpagesHover= True
@@ -237,150 +423,79 @@ class ManPagesGUI(QDialog):
         def openPage(self, page, option= True):
             QApplication.setOverrideCursor(QCursor(Qt.BusyCursor))
             if page is None:
-                page= 0
-                if not len(ManPagesGUI.pages):
-                    if namespace.man_directory:
-                        dir= namespace.man_directory
-                    else:
-                        dir= self.man("manpath", ManPagesGUI.POPEN)
-                        dir= dir[1].rstrip() if dir[0] == 0 else path.join(sep, "usr", "share", "man")
-                    for fn in glob(path.join(dir, "man?", "*.gz")):
-                        ManPagesGUI.pages.append(sub(r"(.+)\.([^.]+)\.gz", r"\2 \1", path.basename(fn)))
-                while page < option:
-                    x= randrange(0, len(ManPagesGUI.pages) - 1)
-                    if ManPagesGUI.self.pagesList.findText(ManPagesGUI.pages[x], Qt.MatchFixedString) == -1:
-                        self.openPage(ManPagesGUI.pages[x], False)
-                        page+= 1
+                self.openPage(catalog.load().sample(option, set(ManPagesGUI.self.pagesList.itemText(x).lower() for x in range(ManPagesGUI.self.pagesList.count()))), False)
             elif type(page) == type(bool()):
-                if self.raw and not page:
-                    self.openPage(ManPagesGUI.self.pagesList.currentIndex())
-                else:
-                    self.openPage(ManPagesGUI.self.pagesList.currentIndex() + 1 if page else ManPagesGUI.self.pagesList.currentIndex() - 1, option)
-                self.raw= False
+                self.loader.supersede()
+                self.openPage(ManPagesGUI.self.pagesList.currentIndex() + 1 if page else ManPagesGUI.self.pagesList.currentIndex() - 1, option)
             elif type(page) == type(int()):
                 if page == -3:
                     self.openPage(ManPagesGUI.self.pagesOther.currentText())
                 elif page == -2:
+                    self.loader.supersede()
                     self.openPage(ManPagesGUI.self.pagesList.currentIndex())
                 elif page > -1:
                     ManPagesGUI.self.setWindowTitle("%s: %s" % (PROJECT_NAME, ManPagesGUI.self.pagesList.itemText(page)))
                     ManPagesGUI.self.pagesList.currentIndexChanged[int].disconnect()
                     ManPagesGUI.self.pagesList.setCurrentIndex(page)
                     ManPagesGUI.self.pagesList.currentIndexChanged[int].connect(partial(self.openPage, -2))
-                    self.setHtml(self.applyStyle(ManPagesGUI.self.pagesList.itemData(page)[0][0]))
+                    entry= ManPagesGUI.self.history.get(ManPagesGUI.self.pagesList.itemText(page))
+                    timing, self.timing= self.timing if self.timing else [ time(), OrderedDict() ], None
+                    if self.layout:
+                        profiler.record("page", self.layout[0], self.layout[1][1])
+                    self.layout= [ ManPagesGUI.self.pagesList.itemText(page), timing, time() ]
+                    html, self.sections= pageSections(entry[0][0], SECTIONCHUNK) if int(namespace.progressive_size) and len(entry[0][0]) > int(namespace.progressive_size) * 1024 else [ entry[0][0], list() ]
+                    self.setHtml(html)
+                    self.prefetcher.start(entry[0][0])
                     ManPagesGUI.self.buttonPrevious.setEnabled(True if ManPagesGUI.self.pagesList.currentIndex() > 0 else False)
                     ManPagesGUI.self.buttonNext.setEnabled(True if ManPagesGUI.self.pagesList.currentIndex() < ManPagesGUI.self.pagesList.count() - 1 else False)
                     if not namespace.no_proposal:
                         ManPagesGUI.self.pagesOther.currentIndexChanged[int].disconnect()
                         ManPagesGUI.self.pagesOther.clear()
-                        if len(ManPagesGUI.self.pagesList.itemData(page)[1]) > 1:
+                        if len(entry[1]) > 1:
                             ManPagesGUI.self.pagesOther.setEnabled(True)
                         else:
                             ManPagesGUI.self.pagesOther.setEnabled(False)
-                        for x, item in enumerate(ManPagesGUI.self.pagesList.itemData(page)[1]):
-                            ManPagesGUI.self.pagesOther.addItem(item)
-                            if item == ManPagesGUI.self.pagesList.currentText():
-                                ManPagesGUI.self.pagesOther.setCurrentIndex(x)
+                        ManPagesGUI.self.pagesOther.addItems(entry[1])
+                        if ManPagesGUI.self.pagesList.currentText() in entry[1]:
+                            ManPagesGUI.self.pagesOther.setCurrentIndex(entry[1].index(ManPagesGUI.self.pagesList.currentText()))
                         ManPagesGUI.self.pagesOther.currentIndexChanged[int].connect(partial(self.openPage, -3))
             elif type(page) == type(list()):
-                for x in page:
-                    self.openPage(x, option)
+                self.loader.load(page, option)
             elif page == ManPagesGUI.self.command:
                 pages= page.text()
                 page.setText("")
+                self.loader.cancel()
                 self.openPage(parsePages(pages), True)
             elif type(page) == type(QUrl()):
                 if page.scheme() == ManPagesGUI.manScheme:
                     self.openPage(sub(r"%s:([\S]+)\.(.+)" % ManPagesGUI.manScheme, r"\2 \1", page.toString()))
-                elif page.scheme() == ManPagesGUI.rawScheme:
-                    self.raw= True
-                    ManPagesGUI.self.buttonPrevious.setEnabled(True)
-                    self.setHtml(self.applyStyle("<html><head><style type=\"text/css\"></style></head><body><pre>%s</pre></body></html>" % ManPagesGUI.self.pagesList.itemData(ManPagesGUI.self.pagesList.currentIndex())[0][1][1]))
                 else:
                     QDesktopServices.openUrl(QUrl(page.toString().replace("−", "-")))
             else:
-                default= self.man(parsePages(page)[0], ManPagesGUI.DEFAULTSECTION)
-                if type(default[0]) != type(str()):
-                    if default[0] == -1:
-                        self.addError("%s: %s" % (parsePages(page)[0], ManPagesGUI.notFound), option)
-                    else:
-                        self.addError("%s: %s" % (page, ManPagesGUI.errorOccurred), option)
-                else:
-                    if ManPagesGUI.self.pagesList.findText(default[0], Qt.MatchFixedString) > -1:
-                        if option:
-                            self.openPage(ManPagesGUI.self.pagesList.findText(default[0], Qt.MatchFixedString), option)
-                    else:
-                        sections, source= self.man(parsePages(page)[0], ManPagesGUI.ALLSECTIONS), self.man(parsePages(page)[0], ManPagesGUI.CONTENTSECTION)
-                        if type(source[0]) == type(sections[0]) == type(str()):
-                            ManPagesGUI.self.pagesList.currentIndexChanged[int].disconnect()
-                            ManPagesGUI.self.pagesList.addItem(default[0], [ source, sections ])
-                            ManPagesGUI.self.pagesList.currentIndexChanged[int].connect(partial(self.openPage, -2))
-                            self.openPage(ManPagesGUI.self.pagesList.count() - 1, option)
-                        else:
-                            self.addError("%s: %s" % (page, ManPagesGUI.errorOccurred), option)
+                self.loader.load([ page ], option)
             QApplication.restoreOverrideCursor()
 
-        def man(self, page, option, Tout= 20):
-            cmd= "%s -D%s%s" % (namespace.man_command, " -M%s" % namespace.man_directory if namespace.man_directory else "", " -Len" if namespace.no_locale else "")
-            if option in [ ManPagesGUI.DEFAULTSECTION, ManPagesGUI.FINDFULL, ManPagesGUI.FINDREGEX|ManPagesGUI.FINDFULL ]:
-                fnToP, fnToPr= r"^[\S]+/(\S+)\.(\S+)\.gz$", r"\1(\2)"
-            if option == ManPagesGUI.POPEN:
-                try:
-                    proc= Popen(page, stdout= PIPE, stderr= DEVNULL, universal_newlines= True, bufsize= 1, shell= True)
-                except:
-                    pass
+        def pageLoaded(self, page, option, default, sections, source, show= True):
+            QApplication.setOverrideCursor(QCursor(Qt.BusyCursor))
+            if type(default[0]) != type(str()):
+                if default[0] == -1:
+                    self.addError("%s: %s" % (parsePages(page)[0], ManPagesGUI.notFound), option)
                 else:
-                    try:
-                        source= proc.communicate(timeout= Tout)[0]
-                    except:
-                        pass
-                    else:
-                        return [ proc.returncode, source ]
-            elif option == ManPagesGUI.DEFAULTSECTION:
-                source= self.man("%s -w %s" % (cmd, page), ManPagesGUI.POPEN)
-                if source[0] == 0:
-                    return sub(fnToP, fnToPr, source[1]).splitlines()
-                elif source[0] == 16:
-                    return [ -1 ]
-            elif option == ManPagesGUI.ALLSECTIONS:
-                source= self.man("%s -f %s" % (cmd, page), ManPagesGUI.POPEN)
-                if source[0] == 0:
-                    return sub(compile(r"^([\S]+) (\S+).*$", MULTILINE), r"\1\2", source[1]).splitlines()
-            elif option == ManPagesGUI.CONTENTSECTION:
-                source= self.man("%s -Hcat --nh %s" % (cmd, page), ManPagesGUI.POPEN)
-                if source[0] == 0:
-                    tab1= findall(r"[\S ]+<img src[\S ]+>", source[1])
-                    if len(tab1):
-                        s= self.man("%s -Pcat --nh %s" % (cmd, page), ManPagesGUI.POPEN)
-                        if s[0] == 0:
-                            tab2= findall(r" {7}┌[\S \n]+┘", s[1])
-                            if len(tab1) == len(tab2):
-                                for x, torep in enumerate(tab1):
-                                    source[1]= source[1].replace(torep, self.createTable(tab2[x]))
-                            else:
-                                source[1]= sub(compile(r"<img src[\S ][^>]+>", DOTALL), r"<a href='%s://currentpage'><img class='rawlink' src='' /></a>" % ManPagesGUI.rawScheme, source[1])
-                    else:
-                        s= None
-                    source[1]= sub(r"(\${1}[A-Z_.]+)", r"<envar>\1</envar>", sub(compile(r"<b>([_A-Z.0-9-]+)</b>\((\d+[A-Z]*)\)", DOTALL|IGNORECASE), r"<a href='%s:\1.\2'>\1(\2)</a>" % ManPagesGUI.manScheme, sub(r"(<style type=\"text/css\">)[\S \n]*(</style>)", r"\1\2", sub(compile(r"(\n<a name.+?(?=\n)\n)", DOTALL), r"", sub(r"^[\S \n]+(<style)", r"<html><head><meta charset='utf-8'>\1", sub(r"(?<=<body>)[\S \n]+?(?=<h2>)", r"\n", source[1]))))))
-                    if not namespace.no_url_link:
-                        source[1]= sub(compile(r"(https?://[\dA-Z\.-]+\.[A-Z\.-]{2,6}[\/\w&\-\.−\-;]*)/?(?<!\.)", MULTILINE|DOTALL|IGNORECASE), r"<a href='\1'>\1</a>", source[1])
-                    if not namespace.no_email_link:
-                        source[1]= sub(compile(r"([_A-Z0-9.+-]+@[_A-Z0-9-]+\.[A-Z0-9-.]+)", DOTALL|IGNORECASE), r"<a href='mailto://\1'>\1</a>", source[1])
-                    return [ source[1].replace("<hr>", "").replace("\n\n\n", "\n").replace("\n\n", "\n"), s ]
-            elif option in [ ManPagesGUI.FINDSHORT, ManPagesGUI.FINDFULL, ManPagesGUI.FINDREGEX|ManPagesGUI.FINDSHORT, ManPagesGUI.FINDREGEX|ManPagesGUI.FINDFULL ]:
-                addOption, Tout= [ "k", 25 ] if option in [ ManPagesGUI.FINDSHORT, ManPagesGUI.FINDREGEX|ManPagesGUI.FINDSHORT ] else [ "K -w", 60 * 2 ]
-                if option in [ ManPagesGUI.FINDREGEX|ManPagesGUI.FINDSHORT, ManPagesGUI.FINDREGEX|ManPagesGUI.FINDFULL ]:
-                    addOption, Tout= "%s --regex" % addOption, Tout * 2
-                source= self.man("%s -%s \"%s\"" % (cmd, addOption, page), ManPagesGUI.POPEN, Tout)
-                if source[0] == 0:
-                    if option in [ ManPagesGUI.FINDSHORT, ManPagesGUI.FINDREGEX|ManPagesGUI.FINDSHORT ]:
-                        return source[1].splitlines()
-                    else:
-                        return sub(compile(fnToP, MULTILINE|DOTALL), fnToPr, source[1]).splitlines()
-                    return [ source[1] ]
-                elif source[0] == 16:
-                    return [ -1 ]
-            return [ -2 ]
+                    self.addError("%s: %s" % (page, ManPagesGUI.errorOccurred), option)
+            elif ManPagesGUI.self.pagesList.findText(default[0], Qt.MatchFixedString) > -1:
+                if option:
+                    self.openPage(ManPagesGUI.self.pagesList.findText(default[0], Qt.MatchFixedString), option)
+            elif source is not None and type(source[0]) == type(sections[0]) == type(str()):
+                ManPagesGUI.self.pagesList.currentIndexChanged[int].disconnect()
+                ManPagesGUI.self.history.add(default[0], [ source, sections ])
+                ManPagesGUI.self.pagesList.addItem(default[0])
+                ManPagesGUI.self.pagesList.setToolTip("%s: %d %s" % (gettext("History memory"), ManPagesGUI.self.history.memoryUsage() / 1024, gettext("KiB")))
+                ManPagesGUI.self.pagesList.currentIndexChanged[int].connect(partial(self.openPage, -2))
+                if show:
+                    self.openPage(ManPagesGUI.self.pagesList.count() - 1, option)
+            else:
+                self.addError("%s: %s" % (page, ManPagesGUI.errorOccurred), option)
+            QApplication.restoreOverrideCursor()
 
         def addError(self, error, option):
             if option:
@@ -394,68 +509,189 @@ class ManPagesGUI(QDialog):
             ManPagesGUI.self.command.info.setVisible(True)
             ManPagesGUI.self.command.setTextMargins(0, 0, ManPagesGUI.self.command.info.minimumSizeHint().height(), 0)
 
-        def createTable(self, raw, tab= ""):
-            for i, line in enumerate(raw.splitlines()):
-                if line.strip().startswith("┌"):
-                    tab= "<table class='add'>"
-                elif line.strip().startswith("│"):
-                    tab= "%s<tr>" % tab
-                    for cell in line.split("│"):
-                        if len(cell.strip()):
-                            tab= "%s%s%s%s" % (tab, "<th class='add'>" if i == 1 else "<td class='add'>", cell.strip(), "</th>" if i == 1 else "</td>")
-                    tab= "%s</tr>" % tab
-                elif line.strip().startswith("└"):
-                    tab= "%s</table>" % tab
-            return tab
-
-        def applyStyle(self, html):
-            return sub(r"(<style type=\"text/css\">)(</style>)", r"\1%s\2" % dedent(self.css), html)
+        def displayed(self, ok):
+            if self.layout:
+                label, timing, start= self.layout
+                timing[1]["layout"], timing[1]["total"]= time() - start, time() - timing[0]
+                profiler.record("page", label, timing[1])
+                self.layout= None
+                if namespace.startup_time:
+                    ManPagesGUI.self.started()
+            if len(self.sections):
+                QTimer.singleShot(0, partial(self.appendSections, self.sections))
+
+        def appendSections(self, sections):
+            if sections is self.sections and len(sections):
+                self.page().mainFrame().documentElement().findFirst("body").appendInside(sections.pop(0))
+                QTimer.singleShot(0, partial(self.appendSections, sections))
+
+        def applyTheme(self):
+            self.settings().setUserStyleSheetUrl(QUrl("data:text/css;charset=utf-8;base64,%s" % str(QByteArray(styleSheet().encode("utf-8")).toBase64(), encoding= "utf8")))
 
     class TextSearchDialog(Dialog):
 
+        class Searcher(QObject):
+            found= pyqtSignal(int, object)
+
+            def __init__(self):
+                super().__init__()
+                self.ticket, self.known, self.dialog, self.text, self.start= 0, set(), None, None, None
+                self.found.connect(self.received)
+
+            def start(self, text, regex, title, header):
+                self.cancel()
+                self.text, self.start= text, time()
+                self.known, self.dialog= set(), ManPagesGUI.TextSearchDialog.ResultDialog(title, list(), header, True)
+                self.dialog.closed.connect(self.cancel)
+                ManPagesGUI.resultDialog= self.dialog
+                self.dialog.show()
+                ManPagesGUI.self.manpages.loader.pool.submit(self.scan, self.ticket, text, regex)
+
+            def scan(self, ticket, text, regex):
+                files= list(manFiles(manRoots()))
+                try:
+                    with ProcessPoolExecutor(max_workers= cpu_count(), mp_context= get_context("spawn")) as pool:
+                        jobs= [ pool.submit(grepPages, files[i:i + 32], text, regex) for i in range(0, len(files), 32) ]
+                        for job in as_completed(jobs):
+                            if ticket != self.ticket:
+                                for x in jobs:
+                                    x.cancel()
+                                break
+                            self.found.emit(ticket, [ pageLabel(fn) for fn in job.result() ])
+                finally:
+                    self.found.emit(ticket, None)
+
+            def received(self, ticket, source):
+                if ticket != self.ticket:
+                    return
+                if source is None:
+                    self.ticket+= 1
+                    profiler.record("search", self.text, OrderedDict([ [ "scan", time() - self.start ] ]))
+                    if self.dialog.table.rowCount():
+                        self.dialog.finish()
+                    else:
+                        self.dialog.close()
+                        QMessageBox.critical(ManPagesGUI.self, "\0", ManPagesGUI.notFound, QMessageBox.Ok)
+                else:
+                    source= [ x for x in OrderedDict.fromkeys(source) if x not in self.known ]
+                    self.known.update(source)
+                    if len(source):
+                        self.dialog.addRows(source)
+
+            def cancel(self):
+                self.ticket+= 1
+
         class ResultDialog(Dialog):
+            closed= pyqtSignal()
 
-            class TableWidget(QTableWidget):
+            class TableModel(QAbstractTableModel):
+
+                def __init__(self, source, header):
+                    super().__init__()
+                    self.header, self.rows, self.keys, self.column, self.descending= header, [ x if len(header) > 1 else [ x ] for x in source ], None, None, False
+
+                def rowCount(self, parent= QModelIndex()):
+                    return 0 if parent.isValid() else len(self.rows)
+
+                def columnCount(self, parent= QModelIndex()):
+                    return 0 if parent.isValid() else len(self.header)
+
+                def headerData(self, section, orientation, role= Qt.DisplayRole):
+                    if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+                        return self.header[section]
+                    return None
+
+                def data(self, index, role= Qt.DisplayRole):
+                    if role == Qt.DisplayRole and index.isValid():
+                        text= self.rows[len(self.rows) - 1 - index.row() if self.descending else index.row()][index.column()]
+                        return text.replace(" (", "(") if index.column() == 0 else text
+                    return None
+
+                def sort(self, column, order= Qt.AscendingOrder):
+                    self.layoutAboutToBeChanged.emit()
+                    persistent= self.persistentIndexList()
+                    rows= [ self.rows[len(self.rows) - 1 - x.row() if self.descending else x.row()] for x in persistent ]
+                    if column != self.column:
+                        self.rows.sort(key= lambda x: x[column].lower())
+                        self.keys, self.column= [ x[column].lower() for x in self.rows ], column
+                    self.descending= order == Qt.DescendingOrder
+                    positions= { id(x): i for i, x in enumerate(self.rows) }
+                    self.changePersistentIndexList(persistent, [ self.index(len(self.rows) - 1 - positions[id(x)] if self.descending else positions[id(x)], y.column()) for x, y in zip(rows, persistent) ])
+                    self.layoutChanged.emit()
+
+                def appendRows(self, source):
+                    source= [ x if len(self.header) > 1 else [ x ] for x in source ]
+                    if self.column is None:
+                        self.beginInsertRows(QModelIndex(), len(self.rows), len(self.rows) + len(source) - 1)
+                        self.rows.extend(source)
+                        self.endInsertRows()
+                    else:
+                        for row in source:
+                            key= row[self.column].lower()
+                            i= bisect_right(self.keys, key)
+                            self.beginInsertRows(QModelIndex(), len(self.rows) - i if self.descending else i, len(self.rows) - i if self.descending else i)
+                            self.rows.insert(i, row)
+                            self.keys.insert(i, key)
+                            self.endInsertRows()
+
+            class TableView(QTableView):
 
                 def __init__(self, source, header, w= 0):
                     super().__init__()
+                    self.setModel(ManPagesGUI.TextSearchDialog.ResultDialog.TableModel(source, header))
                     self.setSortingEnabled(True)
                     self.sortByColumn(0, Qt.AscendingOrder)
                     self.verticalHeader().setVisible(False)
+                    self.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+                    self.verticalHeader().setDefaultSectionSize(self.fontMetrics().height() + 6)
                     self.setSelectionMode(QAbstractItemView.MultiSelection)
                     self.setSelectionBehavior(QAbstractItemView.SelectRows)
-                    self.setColumnCount(len(header))
-                    self.setHorizontalHeaderLabels(header)
-                    self.setRowCount(len(source))
-                    self.selectionModel().selectionChanged.connect(self.actualizeButton)
-                    if len(header) > 1:
-                        for i, item in enumerate(source):
-                            self.setItem(i, 0, QTableWidgetItem(item[0].replace(" (", "(")))
-                            self.setItem(i, 1, QTableWidgetItem(item[1]))
-                    else:
-                        for i, item in enumerate(source):
-                            self.setItem(i, 0, QTableWidgetItem(item))
+                    self.horizontalHeader().setResizeContentsPrecision(256)
                     self.resizeColumnsToContents()
-                    self.resizeRowsToContents()
                     for i in range(len(header)):
                         w+= self.columnWidth(i)
                     self.setMinimumWidth(w)
 
+                def rowCount(self):
+                    return self.model().rowCount()
+
+                def addRows(self, source):
+                    self.model().appendRows(source)
+                    if self.rowCount() == len(source):
+                        self.resizeColumnsToContents()
+
                 def mouseDoubleClickEvent(self, event):
                     pass
 
             # Init de ResultDialog
-            def __init__(self, title, source, header):
+            def __init__(self, title, source, header, running= False):
                 super().__init__(title)
                 self.setContextMenuPolicy(Qt.CustomContextMenu)
                 self.customContextMenuRequested.connect(self.openContextMenu)
                 self.buttonValidate.clicked.connect(self.openpages)
-                self.table= self.TableWidget(source, header)
+                self.title, self.running, self.table= title, running, self.TableView(source, header)
+                self.table.selectionModel().selectionChanged.connect(self.actualizeButton)
                 self.actualizeButton()
+                self.actualizeTitle()
                 self.layout.insertWidget(0, self.table)
 
+            def closeEvent(self, event):
+                self.closed.emit()
+                super().closeEvent(event)
+
+            def addRows(self, source):
+                self.table.addRows(source)
+                self.actualizeTitle()
+
+            def finish(self):
+                self.running= False
+                self.actualizeTitle()
+
+            def actualizeTitle(self):
+                self.setWindowTitle("%s(%d)%s" % (self.title, self.table.rowCount(), "…" if self.running else ""))
+
             def actualizeButton(self):
-                self.buttonValidate.setEnabled(True if len(self.table.selectionModel().selectedRows()) else False)
+                self.buttonValidate.setEnabled(self.table.selectionModel().hasSelection())
 
             def openContextMenu(self, point):
                 contextMenu= QMenu()
@@ -464,8 +700,7 @@ class ManPagesGUI(QDialog):
                 contextMenu.exec_(self.mapToGlobal(point))
 
             def openpages(self):
-                for item in self.table.selectionModel().selectedRows():
-                    ManPagesGUI.self.manpages.openPage(self.table.item(item.row(), 0).text(), False)
+                ManPagesGUI.self.manpages.openPage([ item.data() for item in self.table.selectionModel().selectedRows() ], False)
 
         # Init de TextSearchDialog
         def __init__(self):
@@ -484,29 +719,49 @@ class ManPagesGUI(QDialog):
             self.layout.insertWidget(0, self.edit)
             self.layout.insertWidget(1, self.regex)
             self.layout.insertWidget(2, zButtons)
+            self.searcher= self.Searcher()
             self.edit.setFocus()
 
+        def exec_(self):
+            ManPagesGUI.self.manpages.loader.pool.submit(whatis.load)
+            super().exec_()
+
         def launchSearch(self):
             QApplication.setOverrideCursor(QCursor(Qt.BusyCursor))
-            source= ManPagesGUI.self.manpages.man(self.edit.text(), ManPagesGUI.FINDREGEX if self.regex.isChecked() else 0 | ManPagesGUI.FINDSHORT if self.r0.isChecked() or self.r1.isChecked() else ManPagesGUI.FINDFULL)
+            timings, start= OrderedDict(), time()
+            if self.r2.isChecked():
+                source= index.search(self.edit.text(), self.regex.isChecked())
+                timings["index"]= time() - start
+                if source is None:
+                    QApplication.restoreOverrideCursor()
+                    try:
+                        if self.regex.isChecked():
+                            compile(self.edit.text())
+                    except:
+                        QMessageBox.critical(ManPagesGUI.self, "\0", ManPagesGUI.errorOccurred, QMessageBox.Ok)
+                    else:
+                        self.close()
+                        self.searcher.start(self.edit.text(), self.regex.isChecked(), "%s: %s" % (self.searchIn, self.content), [ self.name ])
+                    return
+            else:
+                whatis.load()
+                timings["man -k"], start= time() - start, time()
+                source= whatis.search(self.edit.text(), 0 if self.r0.isChecked() else 1, WhatisIndex.REGEX if self.regex.isChecked() else WhatisIndex.SUBSTRING)
+                timings["apropos"]= time() - start
             QApplication.restoreOverrideCursor()
-            if type(source[0]) == type(str()):
+            start= time()
+            if type(source[0]) != type(int()):
                 if self.r2.isChecked():
                     title, source, header= self.content, list(set(source)), [ self.name ]
                 else:
-                    fl= list()
-                    for line in source:
-                        line= sub(r"([\S ]+)\) +- ([\S ]+)", r"\1)#\2", line).split("#")
-                        if self.regex.isChecked() and findall(r"%s" % self.edit.text(), line[0 if self.r0.isChecked() else 1], IGNORECASE) or not self.regex.isChecked() and self.edit.text() in line[0 if self.r0.isChecked() else 1]:
-                            fl.append(line)
-                    title, source, header= self.name if self.r0.isChecked() else self.description, fl, [ self.name, self.description ]
-                if len(source):
-                    self.close()
-                    ManPagesGUI.resultDialog= self.ResultDialog("%s: %s(%d)" % (self.searchIn, title, len(source)), source, header)
-                    ManPagesGUI.resultDialog.show()
-                else:
-                    QMessageBox.critical(ManPagesGUI.self, "\0", ManPagesGUI.notFound, QMessageBox.Ok)
+                    title, header= self.name if self.r0.isChecked() else self.description, [ self.name, self.description ]
+                self.close()
+                ManPagesGUI.resultDialog= self.ResultDialog("%s: %s" % (self.searchIn, title), source, header)
+                ManPagesGUI.resultDialog.show()
+                timings["results"]= time() - start
+                profiler.record("search", self.edit.text(), timings)
             else:
+                profiler.record("search", self.edit.text(), timings)
                 QMessageBox.critical(ManPagesGUI.self, "\0", ManPagesGUI.notFound if source[0] == -1 else ManPagesGUI.errorOccurred, QMessageBox.Ok)
 
     class KeyBindingDialog(Dialog):
@@ -547,7 +802,7 @@ class ManPagesGUI(QDialog):
         # Init de KeyBindingDialog
         def __init__(self, i, fn):
             super().__init__(ManPagesGUI.self.keyBinding)
-            self.wm, self.file, self.edit, self.command= i, fn, self.LineEdit(self), QLineEdit()
+            self.wm, self.file, self.edit, self.command, self.etree= i, fn, self.LineEdit(self), QLineEdit(), import_module("lxml.etree")
             self.command.setMaxLength(48)
             self.buttonValidate.clicked.connect(partial(self.getsetCommand, self.edit, None))
             self.layout.insertWidget(0, QLabel("%s?\n%s.\n" % (gettext("What key combination you want to use"), gettext("Valid without keybinding for remove"))))
@@ -559,7 +814,7 @@ class ManPagesGUI(QDialog):
         def exec_(self):
             if self.wm == ManPagesGUI.OpenBox:
                 try:
-                    self.tree= ET.parse(self.file)
+                    self.tree= self.etree.parse(self.file)
                     self.string= sub(r"(\{\S+\})\S+", r"\1", self.tree.getroot().tag)
                     self.keyboard= self.tree.getroot().find("%skeyboard" % self.string)
                 except:
@@ -592,17 +847,17 @@ class ManPagesGUI(QDialog):
                         if not len(key):
                             self.keyboard.remove(current)
                     elif len(key):
-                        keybind= ET.Element('keybind')
+                        keybind= self.etree.Element('keybind')
                         keybind.set("key", key)
-                        action= ET.SubElement(keybind, "action")
+                        action= self.etree.SubElement(keybind, "action")
                         action.set("name", "Execute")
-                        command= ET.SubElement(action, "command")
+                        command= self.etree.SubElement(action, "command")
                         command.text= "%s %s" % (PROJECT_NAME.lower(), self.command.text().strip())
                         self.keyboard.append(keybind)
                     else:
                         return
                     self.tree.write(self.file)
-                    ManPagesGUI.self.manpages.man("openbox --reconfigure", ManPagesGUI.POPEN)
+                    man([ "openbox", "--reconfigure" ], ManPagesGUI.POPEN)
                     self.close()
 
         def isKey(self, key):
@@ -613,27 +868,245 @@ class ManPagesGUI(QDialog):
                         return True
             return False
 
+    class IndexDialog(QProgressDialog):
+        progressed= pyqtSignal(int, int)
+
+        def __init__(self):
+            super().__init__(ManPagesGUI.self)
+            self.setWindowTitle(ManPagesGUI.self.indexUpdate)
+            self.setLabelText(gettext("Indexed pages"))
+            self.setCancelButtonText(gettext("Cancel"))
+            self.cancelled, self.future= False, None
+            self.progressed.connect(self.actualize)
+            self.canceled.connect(self.stop)
+            self.reset()
+
+        def exec_(self):
+            if self.future is None or self.future.done():
+                self.cancelled= False
+                self.setRange(0, 0)
+                self.future= ManPagesGUI.self.manpages.loader.pool.submit(self.update)
+            self.show()
+
+        def update(self):
+            try:
+                index.update(self.report)
+                catalog.refresh()
+                graph.start()
+            finally:
+                self.progressed.emit(-1, -1)
+
+        def report(self, done, total):
+            self.progressed.emit(done, total)
+            return not self.cancelled
+
+        def actualize(self, done, total):
+            if done < 0:
+                self.reset()
+                self.hide()
+            else:
+                self.setRange(0, total)
+                self.setValue(done)
+
+        def stop(self):
+            self.cancelled= True
+
+    class StatsDialog(MDialog):
+
+        # Init de StatsDialog
+        def __init__(self):
+            super().__init__(ManPagesGUI.self.statistics)
+            self.label, buttonClose, layout= QLabel(), QPushButton(self.style().standardIcon(QStyle.SP_DialogCloseButton), ""), QVBoxLayout(self)
+            self.label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+            buttonClose.clicked.connect(self.close)
+            layout.addWidget(self.label)
+            layout.addWidget(buttonClose)
+            layout.setSizeConstraint(QLayout.SetFixedSize)
+
+        def exec_(self):
+            rows= [ "<tr>%s</tr>" % "".join("<th>%s</th>" % x for x in [ gettext("Stage"), gettext("Count"), "p50 (ms)", "p90 (ms)", "p99 (ms)", "%s (ms)" % gettext("Max") ]) ]
+            for stage, count, *times in profiler.statistics():
+                rows.append("<tr><td>%s</td><td align='right'>%d</td>%s</tr>" % (stage, count, "".join("<td align='right'>%.1f</td>" % x for x in times)))
+            self.label.setText("%s<p>%s</p>" % ("<table cellspacing='0' cellpadding='3'>%s</table>" % "".join(rows) if len(rows) > 1 else gettext("No timing recorded"), ", ".join("%s: %d" % x for x in zip([ gettext("Spawned processes"), gettext("Reused"), gettext("Killed"), gettext("Timed out") ], broker.counters.values()))))
+            super().exec_()
+
     class Menu(QMenu):
 
         def __init__(self, parent):
             super().__init__()
-            AkeyBinding, Aabout, AtextSearch= None, QAction(parent.about, self, triggered= parent.AboutDialog().exec_), QAction(parent.textSearch, self, triggered= parent.TextSearchDialog().exec_)
-            for i, fn in enumerate([ path.join(path.expanduser("~"), ".config", "openbox", "lxde-rc.xml") ]):
-                if access(fn, F_OK|W_OK):
-                    if i == ManPagesGUI.OpenBox and LXML:
-                        AkeyBinding= QAction(parent.keyBinding, self, triggered= parent.KeyBindingDialog(i, fn).exec_)
-                    break
-            if AkeyBinding is None:
-                AkeyBinding= QAction(parent.keyBinding, self)
-                AkeyBinding.setEnabled(False)
-            self.addAction(Aabout)
-            self.addAction(AtextSearch)
-            self.addAction(AkeyBinding)
+            self.dialogs, self.keyBinding= dict(), None
+            for text, name in [ [ parent.about, "AboutDialog" ], [ parent.textSearch, "TextSearchDialog" ], [ parent.indexUpdate, "IndexDialog" ], [ parent.statistics, "StatsDialog" ] ]:
+                self.addAction(QAction(text, self, triggered= partial(self.openDialog, name)))
+            self.links= [ QAction(parent.linksHere, self, triggered= partial(self.showLinks, True)), QAction(parent.linksFrom, self, triggered= partial(self.showLinks, False)) ]
+            self.addActions(self.links)
+            self.addAction(QAction(parent.themeColors, self, checkable= True, checked= namespace.theme_color, toggled= self.toggleTheme))
+            self.addAction(QAction(parent.keyBinding, self, triggered= partial(self.openDialog, "KeyBindingDialog")))
+            self.actions()[-1].setEnabled(False)
+            self.aboutToShow.connect(self.findKeyBinding)
+            self.aboutToShow.connect(self.actualizeLinks)
+
+        def findKeyBinding(self):
+            if self.keyBinding is None:
+                self.keyBinding= False
+                for i, fn in enumerate([ path.join(path.expanduser("~"), ".config", "openbox", "lxde-rc.xml") ]):
+                    if access(fn, F_OK|W_OK):
+                        if i == ManPagesGUI.OpenBox and LXML:
+                            self.keyBinding= [ i, fn ]
+                        break
+                self.actions()[-1].setEnabled(self.keyBinding is not False)
+
+        def actualizeLinks(self):
+            for action in self.links:
+                action.setEnabled(ManPagesGUI.self.pagesList.count() > 0)
+
+        def showLinks(self, backward, checked= False):
+            label= ManPagesGUI.self.pagesList.currentText()
+            source= graph.links(label, backward)
+            if source is None:
+                graph.start()
+                QMessageBox.information(ManPagesGUI.self, "\0", gettext("Links index is being built, try again later"), QMessageBox.Ok)
+            elif not len(source):
+                QMessageBox.critical(ManPagesGUI.self, "\0", ManPagesGUI.notFound, QMessageBox.Ok)
+            else:
+                ManPagesGUI.resultDialog= ManPagesGUI.TextSearchDialog.ResultDialog("%s: %s" % (ManPagesGUI.self.linksHere if backward else ManPagesGUI.self.linksFrom, label), source, [ gettext("Name's page") ])
+                ManPagesGUI.resultDialog.show()
+
+        def toggleTheme(self, checked):
+            namespace.theme_color= checked
+            ManPagesGUI.self.manpages.applyTheme()
+
+        def openDialog(self, name, checked= False):
+            if name not in self.dialogs:
+                self.dialogs[name]= getattr(ManPagesGUI, name)(*self.keyBinding) if name == "KeyBindingDialog" else getattr(ManPagesGUI, name)()
+            self.dialogs[name].exec_()
 
         def closeEvent(self, event):
             ManPagesGUI.self.command.setFocus()
             super().closeEvent(event)
 
+    class Server(QLocalServer):
+
+        def __init__(self):
+            super().__init__()
+            self.setSocketOptions(QLocalServer.UserAccessOption)
+            self.newConnection.connect(self.accept)
+            probe= QLocalSocket()
+            probe.connectToServer(serverName())
+            if probe.waitForConnected(500):
+                probe.disconnectFromServer()
+            elif not self.listen(serverName()):
+                QLocalServer.removeServer(serverName())
+                self.listen(serverName())
+
+        def accept(self):
+            while self.hasPendingConnections():
+                socket= self.nextPendingConnection()
+                socket.disconnected.connect(partial(self.received, socket))
+                if socket.state() == QLocalSocket.UnconnectedState:
+                    self.received(socket)
+
+        def received(self, socket):
+            try:
+                pages, random= loads(bytes(socket.readAll()).decode("utf-8")) if socket.bytesAvailable() else [ None, 0 ]
+            except:
+                pages, random= None, 0
+            socket.deleteLater()
+            if pages is not None:
+                ManPagesGUI.self.showNormal()
+                ManPagesGUI.self.raise_()
+                ManPagesGUI.self.activateWindow()
+                if random:
+                    ManPagesGUI.self.manpages.openPage(None, random)
+                ManPagesGUI.self.manpages.openPage(pages, True)
+
+    class Watcher(QObject):
+        scanned= pyqtSignal(object)
+
+        def __init__(self):
+            super().__init__()
+            self.pool, self.snapshot, self.pending, self.polled, self.watcher, self.timer, self.poller= ThreadPoolExecutor(max_workers= 1), dict(), set(), dict(), QFileSystemWatcher(), QTimer(), QTimer()
+            self.timer.setSingleShot(True)
+            self.timer.timeout.connect(self.scan)
+            self.poller.timeout.connect(self.poll)
+            self.watcher.directoryChanged.connect(self.touched)
+            self.scanned.connect(self.applied)
+            self.pool.submit(self.rescan, None)
+
+        @staticmethod
+        def signature(dir):
+            try:
+                return [ stat(dir).st_mtime_ns, stat(dir).st_size ]
+            except:
+                return None
+
+        @staticmethod
+        def dirFiles(dir):
+            try:
+                return dict((x.path, [ x.stat().st_mtime_ns, x.stat().st_size ]) for x in scandir(dir) if x.is_file())
+            except:
+                return dict()
+
+        def touched(self, dir):
+            self.pending.add(dir)
+            self.timer.start(2000)
+
+        def poll(self):
+            for dir, signature in list(self.polled.items()):
+                if self.signature(dir) != signature:
+                    self.polled[dir]= self.signature(dir)
+                    self.touched(dir)
+
+        def scan(self):
+            self.pool.submit(self.rescan, self.pending)
+            self.pending= set()
+
+        def rescan(self, touched):
+            start, bases, dirs, added, changed, removed= time(), manBases(manRoots()), manDirectories(manRoots()), dict(), dict(), dict()
+            for dir in [ x for x in self.snapshot if x not in dirs ]:
+                removed.update(self.snapshot.pop(dir))
+            for dir in dirs:
+                if touched is None or dir in touched or dir not in self.snapshot:
+                    files, old= self.dirFiles(dir), self.snapshot.get(dir, dict())
+                    added.update((x, y) for x, y in files.items() if x not in old)
+                    changed.update((x, y) for x, y in old.items() if x in files and files[x] != y)
+                    removed.update((x, y) for x, y in old.items() if x not in files)
+                    self.snapshot[dir]= files
+            timings= OrderedDict([ [ "rescan", time() - start ] ])
+            if touched is None:
+                added, changed, removed= dict(), dict(), dict()
+            elif len(added) or len(changed) or len(removed):
+                start, files= time(), OrderedDict((x, y[0]) for z in self.snapshot.values() for x, y in z.items())
+                catalog.refresh()
+                whatis.clear()
+                if index.load():
+                    index.update(files= files)
+                if graph.load():
+                    graph.update(files)
+                timings["refresh"]= time() - start
+            self.scanned.emit([ bases + dirs, added, changed, removed, timings ])
+
+        def applied(self, result):
+            dirs, added, changed, removed, timings= result
+            watched= set(self.watcher.directories()).union(self.polled)
+            for dir in watched.difference(dirs):
+                if dir in self.polled:
+                    self.polled.pop(dir)
+                else:
+                    self.watcher.removePath(dir)
+            for dir in [ x for x in dirs if x not in watched ]:
+                if not path.isdir(dir) or not self.watcher.addPath(dir):
+                    self.polled[dir]= self.signature(dir)
+            if len(self.polled) and not self.poller.isActive():
+                self.poller.start(30000)
+            elif not len(self.polled):
+                self.poller.stop()
+            if len(added) or len(changed) or len(removed):
+                for fn, old in list(changed.items()) + list(removed.items()):
+                    if cache:
+                        cache.discard(fn, old[0])
+                ManPagesGUI.self.manpages.prefetcher.discard(set(added).union(changed, removed))
+                profiler.record("manpath", "+%d ~%d -%d" % (len(added), len(changed), len(removed)), timings)
+
     # Init de ManPagesGUI
     def __init__(self):
         super().__init__()
@@ -651,7 +1124,7 @@ class ManPagesGUI(QDialog):
         self.buttonExtra.setIconSize(self.buttonNext.iconSize())
         for b in [ self.buttonPrevious, self.buttonNext, self.buttonExtra, buttonQuit ]:
             b.setAutoDefault(False)
-        box1, box2, self.about, self.keyBinding, self.textSearch= QWidget(), QWidget(), gettext("About"), gettext("Keybinding"), gettext("Text search")
+        box1, box2, self.about, self.keyBinding, self.textSearch, self.indexUpdate, self.statistics, self.themeColors, self.linksHere, self.linksFrom= QWidget(), QWidget(), gettext("About"), gettext("Keybinding"), gettext("Text search"), gettext("Update search index"), gettext("Statistics"), gettext("Use theme's colors"), gettext("What links here"), gettext("Links from this page")
         layoutBox1, layoutBox2= QHBoxLayout(box1), QHBoxLayout(box2)
         layoutBox1.addWidget(self.buttonPrevious)
         layoutBox1.addWidget(self.buttonNext)
@@ -667,7 +1140,7 @@ class ManPagesGUI(QDialog):
             layoutBox2.addWidget(self.pagesOther)
         layoutBox2.addWidget(buttonQuit)
         layoutBox2.setContentsMargins(0, 0, 0, 0)
-        layout, self.settings, self.manpages, self.menu= QVBoxLayout(self), QSettings(PROJECT_TEAM, PROJECT_NAME), self.ManPageZone(), self.Menu(self)
+        layout, self.settings, self.history, self.manpages, self.menu= QVBoxLayout(self), QSettings(PROJECT_TEAM, PROJECT_NAME), History(int(namespace.history_memory)), self.ManPageZone(), self.Menu(self)
         self.buttonExtra.setMenu(self.menu)
         if namespace.no_resize:
             layoutBox1.setStretchFactor(self.command, 1)
@@ -680,21 +1153,79 @@ class ManPagesGUI(QDialog):
         layout.addWidget(box1)
         layout.addWidget(self.manpages)
         layout.addWidget(box2)
+        self.server= self.Server() if namespace.single_instance else None
+        self.watcher= self.Watcher()
+
+    def started(self):
+        if self.isVisible():
+            elapsed= startupTime()
+            profiler.record("startup", PROJECT_NAME, OrderedDict([ [ "first page", elapsed ] ]))
+            print("%s: %.1f ms" % (gettext("Time to first page"), elapsed * 1000), flush= True)
+            self.close()
 
     def closeEvent(self, event):
         if ManPagesGUI.resultDialog:
             ManPagesGUI.resultDialog.close()
+        self.manpages.loader.cancel()
+        self.manpages.loader.pool.shutdown(wait= False)
+        self.manpages.prefetcher.cancel()
+        self.manpages.prefetcher.pool.shutdown(wait= False)
+        if self.server:
+            self.server.close()
+        self.watcher.pool.shutdown(wait= False)
+        graph.pool.shutdown(wait= False)
         self.settings.setValue("position", self.pos())
         self.settings.setValue("geometry", self.saveGeometry())
         self.settings.sync()
         app.quit()
 
+def serverName():
+    return "%s-%d" % (PROJECT_NAME.lower(), getuid())
+
+def forwardPages(pages, random):
+    socket= QLocalSocket()
+    socket.connectToServer(serverName())
+    if not socket.waitForConnected(500):
+        return False
+    socket.write(dumps([ pages, random ]).encode("utf-8"))
+    socket.waitForBytesWritten(1000)
+    socket.disconnectFromServer()
+    if socket.state() != QLocalSocket.UnconnectedState:
+        socket.waitForDisconnected(1000)
+    return True
+
+def startupTime():
+    elapsed= time() - STARTED
+    try:
+        with open("/proc/self/stat") as f:
+            start= int(f.read().rsplit(")", 1)[1].split()[19]) / sysconf("SC_CLK_TCK")
+        with open("/proc/uptime") as f:
+            start= float(f.read().split()[0]) - start
+    except:
+        return elapsed
+    return start if elapsed <= start < elapsed + 60 else elapsed
+
 def invalidArgument(value, text= None):
     raise ArgumentTypeError("'%s' %s" % (value, text if text else gettext("is not valid argument")))
 
 def directory(value):
     return value if path.isdir(value) else invalidArgument(value, gettext("directory not found"))
 
+def profileFile(value):
+    if value != "-":
+        try:
+            open(value, "a").close()
+        except:
+            invalidArgument(value, gettext("file not writable"))
+    return value
+
+def exportDirectory(value):
+    try:
+        makedirs(value, exist_ok= True)
+    except:
+        invalidArgument(value, gettext("directory not writable"))
+    return directory(value)
+
 def command(value):
     return value if which(value) else invalidArgument(value, gettext("command not found"))
 
@@ -710,6 +1241,21 @@ def colsNumber(value):
 def pagesNumber(value):
     return checkInteger(value, 0, 20)
 
+def cacheSize(value):
+    return checkInteger(value, 0, 4096)
+
+def progressiveSize(value):
+    return checkInteger(value, 0, 65536)
+
+def prefetchPages(value):
+    return checkInteger(value, 0, 32)
+
+def percentage(value):
+    return checkInteger(value, 1, 100)
+
+def historySize(value):
+    return checkInteger(value, 1, 1024)
+
 def colorString(value):
     return value if match(r"^[A-F0-9]{6}$", value, IGNORECASE) or value.lower() in [ "aliceblue", "antiquewhite", "aqua", "aquamarine", "azure", "beige", "bisque", "black", "blanchedalmond", "blue", "blueviolet", "brown", "burlywood", "cadetblue", "chartreuse", "chocolate", "coral", "cornflowerblue", "cornsilk", "crimson", "cyan", "darkblue", "darkcyan", "darkgoldenrod", "darkgray", "darkgreen", "darkkhaki", "darkmagenta", "darkolivegreen", "darkorange", "darkorchid", "darkred", "darksalmon", "darkseagreen", "darkslateblue", "darkslategray", "darkturquoise", "darkviolet", "deeppink", "deepskyblue", "dimgray", "dodgerblue", "firebrick", "floralwhite", "forestgreen", "fuchsia", "gainsboro", "ghostwhite", "gold", "goldenrod", "gray", "green", "greenyellow", "honeydew", "hotpink", "indianred", "indigo", "ivory", "khaki", "lavender", "lavenderblush", "lawngreen", "lemonchiffon", "lightblue", "lightcoral", "lightcyan", "lightgoldenrodyellow", "lightgray", "lightgreen", "lightpink", "lightsalmon", "lightseagreen", "lightskyblue", "lightslategray", "lightsteelblue", "lightyellow", "lime", "limegreen", "linen", "magenta", "maroon", "mediumaquamarine", "mediumblue", "mediumorchid", "mediumpurple", "mediumseagreen", "mediumslateblue", "mediumspringgreen", "mediumturquoise", "mediumvioletred", "midnightblue", "mintcream", "mistyrose", "moccasin", "navajowhite", "navy", "oldlace", "olive", "olivedrab", "orange", "orangered", "orchid", "palegoldenrod", "palegreen", "paleturquoise", "palevioletred", "papayawhip", "peachpuff", "peru", "pink", "plum", "powderblue", "purple", "rebeccapurple", "red", "rosybrown", "royalblue", "saddlebrown", "salmon", "sandybrown", "seagreen", "seashell", "sienna", "silver", "skyblue", "slateblue", "slategray", "snow", "springgreen", "steelblue", "tan", "teal", "thistle", "tomato", "turquoise", "violet", "wheat", "white", "whitesmoke", "yellow", "yellowgreen" ] else invalidArgument(value)
 
@@ -739,6 +1285,18 @@ def parsing():
     parser.add_argument("--italic-background", "-ib", type= colorString, action= "store", default= "CornSilk", help= "%s (%s: %%(default)s)" % (gettext("Italic background color"), _def), metavar= _col)
     parser.add_argument("--envar-color", "-vc", type= colorString, action= "store", default= "DarkMagenta", help= "%s (%s: %%(default)s)" % (gettext("Environment variable text color"), _def), metavar= _col)
     parser.add_argument("--envar-background", "-vb", type= colorString, action= "store", default= "CornSilk", help= "%s (%s: %%(default)s)" % (gettext("Environment variable background color"), _def), metavar= _col)
+    parser.add_argument("--cache-size", "-cs", type= cacheSize, action= "store", default= "64", help= "%s (%s: %%(default)s)" % (gettext("Size of rendered pages cache in MiB, 0 disables it"), _def), metavar= _num)
+    parser.add_argument("--clear-cache", "-cc", action= "store_true", help= gettext("Clear rendered pages cache"))
+    parser.add_argument("--history-memory", "-hm", type= historySize, action= "store", default= "32", help= "%s (%s: %%(default)s)" % (gettext("Memory budget of opened pages history in MiB"), _def), metavar= _num)
+    parser.add_argument("--prefetch", "-pf", type= prefetchPages, action= "store", default= "0", help= "%s (%s: %%(default)s)" % (gettext("Number of linked pages rendered in advance, 0 disables it"), _def), metavar= _num)
+    parser.add_argument("--prefetch-cpu", "-pc", type= percentage, action= "store", default= "50", help= "%s (%s: %%(default)s)" % (gettext("System load in percent of the processors above which prefetch pauses"), _def), metavar= _num)
+    parser.add_argument("--prefetch-memory", "-pm", type= historySize, action= "store", default= "16", help= "%s (%s: %%(default)s)" % (gettext("Memory budget of prefetched pages in MiB"), _def), metavar= _num)
+    parser.add_argument("--progressive-size", "-ps", type= progressiveSize, action= "store", default= "512", help= "%s (%s: %%(default)s)" % (gettext("Size in KiB above which pages are displayed section by section, 0 disables it"), _def), metavar= _num)
+    parser.add_argument("--export", "-e", type= exportDirectory, action= "store", default= False, help= "%s (%s: %%(default)s)" % (gettext("Render pages given as arguments, or all pages, to static HTML in directory and exit"), _def), metavar= gettext("directory"))
+    parser.add_argument("--profile", "-pr", type= profileFile, action= "store", default= False, help= "%s (%s: %%(default)s)" % (gettext("Append timings of each stage of page opening and search as JSON lines to file, - for standard error"), _def), metavar= gettext("file"))
+    parser.add_argument("--single-instance", "-si", action= "store_true", help= gettext("Open pages in the already running instance, or become it"))
+    parser.add_argument("--startup-time", "-st", action= "store_true", help= gettext("Display time from launch to first page shown and exit"))
+    parser.add_argument("--update-index", "-ui", action= "store_true", help= gettext("Update content search index and exit"))
     parser.add_argument("--version", "-V", action= "version", version= "%s v%s" % (PROJECT_NAME, PROJECT_VERSION), help= gettext("Display version number and exit"))
     return parser.parse_known_args()
 
@@ -751,12 +1309,1052 @@ def parsePages(extra):
             extra[i]= sub(r"(.+)\((.+)\)", r"\2 \1", page)
     return [ x for x in extra if x != "" and not x.startswith("-") ]
 
+def cacheDirectory(name):
+    directory= path.join(environ.get("XDG_CACHE_HOME", path.join(path.expanduser("~"), ".cache")), PROJECT_NAME.lower(), name)
+    try:
+        makedirs(directory, exist_ok= True)
+    except:
+        pass
+    return directory
+
+class RenderCache:
+
+    def __init__(self, size):
+        self.directory, self.size, self.used= cacheDirectory("html"), size * 1024 * 1024, None
+
+    def key(self, fn, mtime= None):
+        fn= sourcePath(fn)
+        return path.join(self.directory, sha1(repr([ path.realpath(fn), stat(fn).st_mtime_ns if mtime is None else mtime, namespace.no_locale, namespace.no_url_link, namespace.no_email_link, PROJECT_VERSION, RENDER_FORMAT ]).encode("utf-8")).hexdigest())
+
+    def get(self, fn):
+        try:
+            key= self.key(fn)
+            with open(key, "rb") as f:
+                source= loads(decompress(f.read()).decode("utf-8"))
+            utime(key)
+        except:
+            return None
+        return source
+
+    def set(self, fn, source):
+        try:
+            key, (fd, tmp)= self.key(fn), mkstemp(dir= self.directory, prefix= ".")
+            with fdopen(fd, "wb") as f:
+                f.write(compress(dumps(source).encode("utf-8")))
+            replace(tmp, key)
+        except:
+            return
+        self.used= None if self.used is None else self.used + path.getsize(key)
+        if self.used is None or self.used > self.size:
+            self.evict()
+
+    def discard(self, fn, mtime):
+        try:
+            unlink(self.key(fn, mtime))
+        except:
+            return
+        self.used= None
+
+    def entries(self):
+        try:
+            return sorted([ x.stat().st_mtime, x.stat().st_size, x.path ] for x in scandir(self.directory) if x.is_file() and not x.name.startswith("."))
+        except:
+            return list()
+
+    def evict(self):
+        entries= self.entries()
+        self.used= sum(x[1] for x in entries)
+        for x in entries:
+            if self.used <= self.size * 0.9:
+                break
+            try:
+                unlink(x[2])
+            except:
+                pass
+            self.used-= x[1]
+
+    def clear(self):
+        for x in self.entries():
+            try:
+                unlink(x[2])
+            except:
+                pass
+        self.used= 0
+
+class Profiler:
+
+    def __init__(self, fn):
+        self.samples, self.out= OrderedDict(), stderr if fn == "-" else open(fn, "a", encoding= "utf-8") if fn else None
+
+    def record(self, kind, label, timings):
+        for stage, elapsed in timings.items():
+            self.samples.setdefault("%s: %s" % (kind, stage), list()).append(elapsed * 1000)
+        if self.out:
+            self.out.write("%s\n" % dumps(OrderedDict([ [ "time", round(time(), 3) ], [ "kind", kind ], [ "label", label ], [ "stages", OrderedDict([ x, round(y * 1000, 3) ] for x, y in timings.items()) ] ])))
+            self.out.flush()
+
+    def statistics(self):
+        rows= list()
+        for stage, samples in self.samples.items():
+            samples= sorted(samples)
+            rows.append([ stage, len(samples) ] + [ samples[max(0, -(-len(samples) * x // 100) - 1)] for x in [ 50, 90, 99 ] ] + [ samples[-1] ])
+        return rows
+
+class History:
+
+    def __init__(self, budget):
+        self.budget, self.hot, self.cold, self.spilled, self.free, self.spill, self.hotSize, self.coldSize= budget * 1024 * 1024, OrderedDict(), OrderedDict(), dict(), list(), None, 0, 0
+
+    def add(self, label, entry):
+        self.hotSize-= self.hot[label][1] if label in self.hot else 0
+        self.hot[label]= [ entry, getsizeof(entry[0][0]) + sum(getsizeof(x) for x in entry[1]) ]
+        self.hot.move_to_end(label)
+        self.hotSize+= self.hot[label][1]
+        self.balance()
+
+    def get(self, label):
+        if label in self.hot:
+            self.hot.move_to_end(label)
+            return self.hot[label][0]
+        if label in self.cold:
+            entry= self.cold.pop(label)
+            self.coldSize-= len(entry)
+        else:
+            start, size= self.spilled.pop(label)
+            self.spill.seek(start)
+            entry= self.spill.read(size)
+            self.release(start, size)
+        entry= loads(decompress(entry).decode("utf-8"))
+        self.add(label, entry)
+        return entry
+
+    def balance(self):
+        while len(self.hot) > 1 and self.hotSize > self.budget / 2:
+            label, entry= self.hot.popitem(last= False)
+            self.hotSize-= entry[1]
+            self.cold[label]= compress(dumps(entry[0]).encode("utf-8"))
+            self.coldSize+= len(self.cold[label])
+        while len(self.cold) and self.memoryUsage() > self.budget:
+            label, entry= self.cold.popitem(last= False)
+            self.coldSize-= len(entry)
+            if self.spill is None:
+                self.spill= TemporaryFile(prefix= "%s-" % PROJECT_NAME.lower())
+            i= next((i for i, x in enumerate(self.free) if x[1] >= len(entry)), None)
+            if i is None:
+                self.spill.seek(0, 2)
+            else:
+                self.spill.seek(self.free[i][0])
+                self.free[i]= [ self.free[i][0] + len(entry), self.free[i][1] - len(entry) ]
+                if self.free[i][1] == 0:
+                    del self.free[i]
+            self.spilled[label]= [ self.spill.tell(), len(entry) ]
+            self.spill.write(entry)
+
+    def release(self, start, size):
+        self.free.append([ start, size ])
+        self.free.sort()
+        free= [ self.free[0] ]
+        for x in self.free[1:]:
+            if free[-1][0] + free[-1][1] == x[0]:
+                free[-1]= [ free[-1][0], free[-1][1] + x[1] ]
+            else:
+                free.append(x)
+        self.spill.seek(0, 2)
+        if free[-1][0] + free[-1][1] == self.spill.tell():
+            self.spill.truncate(free.pop()[0])
+        self.free= free
+
+    def memoryUsage(self):
+        return self.hotSize + self.coldSize
+
+def manPaths():
+    if namespace.man_directory:
+        return [ path.realpath(namespace.man_directory) ]
+    source= man([ "manpath" ], ManPagesGUI.POPEN)
+    return [ path.realpath(x) for x in source[1].strip().split(":") if len(x) ] if source[0] == 0 and len(source[1].strip()) else [ path.join(sep, "usr", "share", "man") ]
+
+manpath, manpathLock= None, Lock()
+
+def manRoots():
+    global manpath
+    with manpathLock:
+        if manpath is None:
+            manpath= manPaths()
+    return manpath
+
+def localeNames():
+    names= list()
+    for name in [ environ.get(x, "") for x in [ "LC_ALL", "LC_MESSAGES", "LANG" ] ]:
+        if len(name):
+            for x in [ name, name.split(".")[0].split("@")[0], name.split("_")[0].split(".")[0].split("@")[0] ]:
+                if x not in names and x not in [ "C", "POSIX" ]:
+                    names.append(x)
+            break
+    return names
+
+def manBases(roots):
+    return [ base for root in roots for base in [ root ] + ([] if namespace.no_locale else [ path.join(root, x) for x in localeNames() ]) ]
+
+def manDirectories(roots):
+    dirs= list()
+    for base in manBases(roots):
+        try:
+            dirs.extend(sorted(x.path for x in scandir(base) if x.name.startswith("man") and x.is_dir()))
+        except:
+            pass
+    return dirs
+
+def manFiles(roots, files= None, dirs= None):
+    files= OrderedDict() if files is None else files
+    for dir in manDirectories(roots) if dirs is None else dirs:
+        try:
+            for x in scandir(dir):
+                if x.is_file() and x.path not in files:
+                    files[x.path]= x.stat().st_mtime_ns
+        except:
+            pass
+    return files
+
+PAGETOKEN= compile(r"(?:^|\s)(?:(\d\S*) )?([^\s\d]\S*)$")
+WHATISLINE= compile(r"^([\S ]+\)) +- ([\S ]*)$", MULTILINE)
+PAGEREF= compile(r"^[.']BR[ \t]+\"?([_A-Z.0-9-]+)\"?[ \t]+\"?\((\d+[A-Z]*)\)|\\fB([_A-Z.0-9-]+)\\f[RP](?:\\\|)?\((\d+[A-Z]*)\)|^[.']MR[ \t]+([_A-Z.0-9-]+)[ \t]+(\d+[A-Z]*)", IGNORECASE|MULTILINE)
+ROFFCOMMENT, ROFFREQUEST, ROFFSILENT, ROFFESCAPE, TERM= compile(r"\\\".*"), compile(r"^[.'][ \t]*\S+", MULTILINE), compile(r"\\[&%:]"), compile(r"\\[fFsn*]?(?:\[[^]\n]*\]|\(..|[+-]?\d|.)"), compile(r"\w+")
+
+def pageTokens(fn):
+    source= readSource(fn)
+    if source is None:
+        return list()
+    source= ROFFESCAPE.sub(" ", ROFFSILENT.sub("", ROFFREQUEST.sub(" ", ROFFCOMMENT.sub("", source[1].decode("utf-8", "replace")))))
+    return TERM.findall(source.lower())
+
+def pageTerms(files):
+    pages= list()
+    for fn in files:
+        tokens= pageTokens(fn)
+        pages.append([ fn, sorted(set(tokens)), compress(" ".join(tokens).encode("utf-8")) ])
+    return pages
+
+def pageLinks(files):
+    pages= list()
+    for fn in files:
+        source, links= readSource(fn), set()
+        if source is not None and source[0] == fn:
+            for x in PAGEREF.finditer(source[1].decode("utf-8", "replace").replace("\\-", "-")):
+                links.add("%s(%s)" % tuple(y for y in x.groups() if y is not None))
+        pages.append([ fn, sorted(set(x.lower() for x in links)) ])
+    return pages
+
+def grepPages(files, text, regex):
+    pattern, found= compile(text, IGNORECASE) if regex else None, list()
+    for fn in files:
+        source= readSource(fn)
+        if source is not None:
+            source= source[1].decode("utf-8", "replace")
+            if pattern.search(source) if regex else text.lower() in source.lower():
+                found.append(fn)
+    return found
+
+class Catalog:
+
+    class Snapshot:
+
+        def __init__(self, labels, offsets, names):
+            self.labels, self.offsets, self.names= labels, offsets, names
+
+        def __len__(self):
+            return len(self.offsets) - 1
+
+        def __getitem__(self, i):
+            return self.label(i).lower()
+
+        def label(self, i):
+            return self.labels[self.offsets[i]:self.offsets[i + 1]]
+
+    def __init__(self, roots= None):
+        self.roots, self.snapshot, self.dirs, self.loaded, self.lock= roots, self.Snapshot("", array("I", [ 0 ]), dict()), dict(), False, Lock()
+
+    def __len__(self):
+        return len(self.snapshot)
+
+    def __getitem__(self, i):
+        return self.snapshot[i]
+
+    def label(self, i):
+        return self.snapshot.label(i)
+
+    def load(self):
+        with self.lock:
+            if not self.loaded:
+                self.roots= manRoots() if self.roots is None else self.roots
+                fn= path.join(cacheDirectory("catalog"), sha1(repr([ self.roots, [] if namespace.no_locale else localeNames(), PROJECT_VERSION ]).encode("utf-8")).hexdigest())
+                try:
+                    with open(fn, "rb") as f:
+                        self.dirs= dict((x[0], x[1:]) for x in loads(decompress(f.read()).decode("utf-8")))
+                except:
+                    pass
+                if self.scan():
+                    try:
+                        fd, tmp= mkstemp(dir= path.dirname(fn), prefix= ".")
+                        with fdopen(fd, "wb") as f:
+                            f.write(compress(dumps([ [ x ] + y for x, y in self.dirs.items() ]).encode("utf-8")))
+                        replace(tmp, fn)
+                    except:
+                        pass
+                self.loaded= True
+        return self
+
+    def refresh(self):
+        with self.lock:
+            if self.loaded:
+                self.scan()
+
+    def scan(self):
+        dirs, changed= OrderedDict(), False
+        for dir in manDirectories(self.roots):
+            try:
+                mtime= stat(dir).st_mtime_ns
+            except:
+                continue
+            if dir in self.dirs and self.dirs[dir][0] == mtime:
+                dirs[dir]= self.dirs[dir]
+            else:
+                dirs[dir], changed= [ mtime, sorted(set(pageLabel(x) for x in manFiles(None, dirs= [ dir ]))) ], True
+        changed= changed or list(dirs) != list(self.dirs)
+        if changed or not self.loaded:
+            labels, offsets, names= sorted(set(x for y in dirs.values() for x in y[1]), key= str.lower), array("I", [ 0 ]), dict()
+            for i, label in enumerate(labels):
+                offsets.append(offsets[-1] + len(label))
+                names.setdefault(label[:label.rfind("(")].lower(), list()).append(i)
+            self.snapshot= self.Snapshot("".join(labels), offsets, names)
+        self.dirs= dirs
+        return changed
+
+    def sections(self, name):
+        snapshot= self.snapshot
+        return [ snapshot.label(i) for i in snapshot.names.get(name.lower(), list()) ]
+
+    def sample(self, n, exclude= frozenset()):
+        snapshot, found, swaps, k= self.snapshot, list(), dict(), 0
+        while len(found) < n and k < len(snapshot):
+            j= randrange(k, len(snapshot))
+            i, swaps[j]= swaps.get(j, j), swaps.get(k, k)
+            if snapshot[i] not in exclude:
+                found.append(snapshot.label(i))
+            k+= 1
+        return found
+
+    def complete(self, prefix, section= None, limit= 64):
+        snapshot, prefix, found= self.snapshot, prefix.lower(), list()
+        i= bisect_left(snapshot, prefix)
+        while i < len(snapshot) and len(found) < limit and snapshot[i].startswith(prefix):
+            label= snapshot.label(i)
+            if section is None or label[label.rfind("(") + 1:].lower().startswith(section.lower()):
+                found.append(label)
+            i+= 1
+        return found
+
+class WhatisIndex:
+    EXACT, PREFIX, SUBSTRING, REGEX= range(0, 4)
+
+    def __init__(self):
+        self.entries, self.fields, self.failed, self.lock= None, None, False, Lock()
+
+    def load(self):
+        with self.lock:
+            if self.entries is None:
+                source= man(".", ManPagesGUI.FINDREGEX|ManPagesGUI.FINDSHORT)
+                self.entries, self.failed= WHATISLINE.findall("\n".join(source)) if len(source) and type(source[0]) == type(str()) else list(), source[:1] == [ -2 ]
+                self.fields= [ [ x[0] for x in self.entries ], [ x[1] for x in self.entries ] ]
+        return not self.failed
+
+    def clear(self):
+        with self.lock:
+            self.entries, self.fields, self.failed= None, None, False
+
+    def search(self, text, field= 0, mode= SUBSTRING):
+        if not self.load():
+            return [ -2 ]
+        try:
+            if mode == self.EXACT:
+                pattern= compile(r"%s(?: \([^)]*\))?$" % escape(text)).match
+            elif mode == self.PREFIX:
+                pattern= compile(escape(text)).match
+            elif mode == self.SUBSTRING:
+                pattern= compile(escape(text)).search
+            else:
+                pattern= compile(text, IGNORECASE).search
+        except:
+            return [ -2 ]
+        found= [ list(x) for x, y in zip(self.entries, map(pattern, self.fields[field])) if y ]
+        return found if len(found) else [ -1 ]
+
+class FullTextIndex:
+
+    def __init__(self, roots= None):
+        self.roots, self.fn, self.documents, self.terms, self.generation, self.base, self.blobs, self.stamp, self.lock= roots, None, None, None, None, 0, 0, None, Lock()
+
+    def prepare(self):
+        if self.fn is None:
+            self.roots= manRoots() if self.roots is None else self.roots
+            self.fn= path.join(cacheDirectory("index"), sha1(repr([ self.roots, PROJECT_VERSION ]).encode("utf-8")).hexdigest())
+
+    def load(self):
+        self.prepare()
+        try:
+            stamp= stat("%s.postings" % self.fn).st_mtime_ns
+            if stamp != self.stamp:
+                with open("%s.postings" % self.fn, "rb") as f:
+                    size= int.from_bytes(f.read(8), "little")
+                    self.documents, self.terms, self.generation, count= loads(decompress(f.read(size)).decode("utf-8"))
+                self.base, self.stamp= size + 8, stamp
+                self.blobs= self.base + count * array("I").itemsize
+        except:
+            self.documents, self.stamp= None, None
+        return self.documents is not None
+
+    def postings(self, f, term):
+        entry, docs= self.terms.get(term), array("I")
+        if entry:
+            f.seek(self.base + entry[0] * docs.itemsize)
+            docs.frombytes(f.read(entry[1] * docs.itemsize))
+        return docs
+
+    def tokens(self, f, doc):
+        f.seek(self.blobs + self.documents[doc][1])
+        return decompress(f.read(self.documents[doc][2])).decode("utf-8")
+
+    def search(self, text, regex= False):
+        if not self.load():
+            return None
+        with open("%s.postings" % self.fn, "rb") as f:
+            if regex:
+                try:
+                    pattern= compile(text, IGNORECASE)
+                except:
+                    return [ -2 ]
+                docs= set()
+                for term in self.terms:
+                    if pattern.search(term):
+                        docs.update(self.postings(f, term))
+            else:
+                terms, docs= TERM.findall(text.lower()), None
+                for term in sorted(set(terms), key= lambda x: self.terms.get(x, [ 0, 0 ])[1]):
+                    docs= set(self.postings(f, term)) if docs is None else docs.intersection(self.postings(f, term))
+                    if not len(docs):
+                        break
+                if len(terms) > 1 and docs:
+                    docs= [ x for x in docs if " %s " % " ".join(terms) in " %s " % self.tokens(f, x) ]
+        return [ pageLabel(self.documents[x][0]) for x in sorted(docs) ] if docs else [ -1 ]
+
+    def update(self, progress= None, files= None):
+        self.prepare()
+        with self.lock:
+            return self.refresh(progress, files)
+
+    def refresh(self, progress, files):
+        try:
+            with open("%s.forward" % self.fn, "rb") as f:
+                forward= loads(decompress(f.read()).decode("utf-8"))
+            forward= forward[1] if self.load() and forward[0] == self.generation else dict()
+        except:
+            forward= dict()
+        files= manFiles(self.roots) if files is None else files
+        removed= [ x for x in forward if x not in files ]
+        for fn in removed:
+            forward.pop(fn)
+        stale, fresh, done, complete= [ x for x in files if x not in forward or forward[x][0] != files[x] ], dict(), 0, True
+        if not len(stale) and not len(removed) and self.load():
+            return complete
+        if len(stale):
+            with ProcessPoolExecutor(max_workers= cpu_count(), mp_context= get_context("spawn")) as pool:
+                jobs= [ pool.submit(pageTerms, stale[i:i + 64]) for i in range(0, len(stale), 64) ]
+                for job in as_completed(jobs):
+                    for fn, terms, blob in job.result():
+                        forward[fn], fresh[fn]= [ files[fn], terms, None, len(blob) ], blob
+                    done+= 64
+                    if progress and progress(min(done, len(stale)), len(stale)) is False:
+                        complete= False
+                        for x in jobs:
+                            x.cancel()
+                        break
+        docs, inverted, offset= sorted(forward), dict(), 0
+        for i, fn in enumerate(docs):
+            for term in forward[fn][1]:
+                inverted.setdefault(term, array("I")).append(i)
+        terms, count= dict(), 0
+        for term, postings in inverted.items():
+            terms[term]= [ count, len(postings) ]
+            count+= len(postings)
+        documents, generation= list(), time_ns()
+        for fn in docs:
+            documents.append([ fn, offset, forward[fn][3] ])
+            offset+= forward[fn][3]
+        header= compress(dumps([ documents, terms, generation, count ]).encode("utf-8"))
+        fd, tmp= mkstemp(dir= path.dirname(self.fn), prefix= ".")
+        with fdopen(fd, "wb") as f, open("%s.postings" % self.fn, "rb") if path.isfile("%s.postings" % self.fn) else TemporaryFile() as old:
+            f.write(len(header).to_bytes(8, "little"))
+            f.write(header)
+            for postings in inverted.values():
+                f.write(postings.tobytes())
+            for fn in docs:
+                if fn in fresh:
+                    f.write(fresh[fn])
+                else:
+                    old.seek(self.blobs + forward[fn][2])
+                    f.write(old.read(forward[fn][3]))
+        for doc in documents:
+            forward[doc[0]][2]= doc[1]
+        replace(tmp, "%s.postings" % self.fn)
+        fd, tmp= mkstemp(dir= path.dirname(self.fn), prefix= ".")
+        with fdopen(fd, "wb") as f:
+            f.write(compress(dumps([ generation, forward ]).encode("utf-8")))
+        replace(tmp, "%s.forward" % self.fn)
+        return complete
+
+class LinkGraph:
+
+    def __init__(self, roots= None):
+        self.roots, self.fn, self.labels, self.arrays, self.stamp, self.lock, self.pool= roots, None, None, None, None, Lock(), ThreadPoolExecutor(max_workers= 1)
+
+    def prepare(self):
+        if self.fn is None:
+            self.roots= manRoots() if self.roots is None else self.roots
+            self.fn= path.join(cacheDirectory("links"), sha1(repr([ self.roots, PROJECT_VERSION ]).encode("utf-8")).hexdigest())
+
+    def load(self):
+        self.prepare()
+        try:
+            stamp= stat("%s.graph" % self.fn).st_mtime_ns
+            if stamp != self.stamp:
+                with open("%s.graph" % self.fn, "rb") as f:
+                    size= int.from_bytes(f.read(8), "little")
+                    labels, count, arrays= loads(decompress(f.read(size)).decode("utf-8")) + [ list() ]
+                    for n in [ len(labels) + 1, count, len(labels) + 1, count ]:
+                        arrays.append(array("I"))
+                        arrays[-1].frombytes(f.read(n * arrays[-1].itemsize))
+                self.labels, self.arrays, self.stamp= labels, arrays, stamp
+        except:
+            self.labels, self.stamp= None, None
+        return self.labels is not None
+
+    def links(self, label, backward= False):
+        if not self.load():
+            return None
+        label, (offsets, targets)= label.lower(), self.arrays[2:] if backward else self.arrays[:2]
+        i= bisect_left(self.labels, label)
+        return [ self.labels[x] for x in targets[offsets[i]:offsets[i + 1]] ] if i < len(self.labels) and self.labels[i] == label else list()
+
+    def start(self):
+        if not self.lock.locked():
+            self.pool.submit(self.update)
+
+    def update(self, files= None):
+        self.prepare()
+        with self.lock:
+            try:
+                with open("%s.refs" % self.fn, "rb") as f:
+                    refs= loads(decompress(f.read()).decode("utf-8"))
+            except:
+                refs= dict()
+            files= manFiles(self.roots) if files is None else files
+            removed= [ x for x in refs if x not in files ]
+            for fn in removed:
+                refs.pop(fn)
+            stale= [ x for x in files if x not in refs or refs[x][0] != files[x] ]
+            if not len(stale) and not len(removed) and self.load():
+                return True
+            if len(stale):
+                with ProcessPoolExecutor(max_workers= max(cpu_count() // 2, 1), mp_context= get_context("spawn"), initializer= nice, initargs= (19, )) as pool:
+                    for job in as_completed([ pool.submit(pageLinks, stale[i:i + 64]) for i in range(0, len(stale), 64) ]):
+                        for fn, links in job.result():
+                            refs[fn]= [ files[fn], links ]
+            edges, names= dict(), dict()
+            for fn in refs:
+                edges.setdefault(pageLabel(fn).lower(), set()).update(refs[fn][1])
+            for label in edges:
+                names.setdefault(label[:label.rfind("(")], list()).append(label)
+            for label, links in edges.items():
+                edges[label]= set(x if x in edges else next((y for y in names.get(x[:x.rfind("(")], list()) if pageMatches(y, "%s %s" % (x[x.rfind("(") + 1:-1], x[:x.rfind("(")]))), x) for x in links)
+                edges[label].discard(label)
+            labels= sorted(set(edges).union(*edges.values()))
+            ids, forward, backward= { x: i for i, x in enumerate(labels) }, [ array("I", [ 0 ]), array("I") ], [ array("I", [ 0 ] * (len(labels) + 1)), None ]
+            for label in labels:
+                forward[1].extend(sorted(ids[x] for x in edges.get(label, list())))
+                forward[0].append(len(forward[1]))
+            for x in forward[1]:
+                backward[0][x + 1]+= 1
+            for i in range(len(labels)):
+                backward[0][i + 1]+= backward[0][i]
+            backward[1], fill= array("I", [ 0 ]) * len(forward[1]), array("I", backward[0])
+            for i in range(len(labels)):
+                for x in forward[1][forward[0][i]:forward[0][i + 1]]:
+                    backward[1][fill[x]], fill[x]= i, fill[x] + 1
+            header= compress(dumps([ labels, len(forward[1]) ]).encode("utf-8"))
+            fd, tmp= mkstemp(dir= path.dirname(self.fn), prefix= ".")
+            with fdopen(fd, "wb") as f:
+                f.write(len(header).to_bytes(8, "little"))
+                f.write(header)
+                for x in forward + backward:
+                    f.write(x.tobytes())
+            replace(tmp, "%s.graph" % self.fn)
+            fd, tmp= mkstemp(dir= path.dirname(self.fn), prefix= ".")
+            with fdopen(fd, "wb") as f:
+                f.write(compress(dumps(refs).encode("utf-8")))
+            replace(tmp, "%s.refs" % self.fn)
+            return True
+
+def pageLabel(fn):
+    return sub(r"^(.+)\.([^.]+)$", r"\1(\2)", sub(r"\.(%s)$" % "|".join(x[1:] for x in COMPRESSIONS), "", path.basename(fn)))
+
+def pageMatches(label, page):
+    section, name= page.split(" ", 1) if " " in page else [ "", page ]
+    return label[:label.rfind("(")].lower() == name.lower() and label[label.rfind("(") + 1:-1].lower().startswith(section.lower())
+
+SOREQUEST= compile(rb"^(?:\.\\\".*\n|\s*\n)*\.so\s+(\S+)\s*$")
+
+def sourcePath(fn, depth= 0):
+    opener= COMPRESSIONS.get(path.splitext(fn)[1], open)
+    try:
+        with opener(fn, "rb") as f:
+            source= f.read(4096)
+            if len(f.read(1)):
+                return fn
+    except:
+        return fn
+    so= SOREQUEST.match(source)
+    if so and depth < 8:
+        target= path.join(path.dirname(path.dirname(fn)), so.group(1).decode("utf-8", "replace"))
+        for ext in [ "" ] + list(COMPRESSIONS):
+            if path.isfile(target + ext):
+                return sourcePath(target + ext, depth + 1)
+    return fn
+
+def readSource(fn, depth= 0):
+    opener= COMPRESSIONS.get(path.splitext(fn)[1], open)
+    if opener is None:
+        return None
+    try:
+        with opener(fn, "rb") as f:
+            source= f.read()
+    except:
+        return None
+    so= SOREQUEST.match(source)
+    if so and depth < 8:
+        fn= path.join(path.dirname(path.dirname(fn)), so.group(1).decode("utf-8", "replace"))
+        for ext in [ "" ] + list(COMPRESSIONS):
+            if path.isfile(fn + ext):
+                return readSource(fn + ext, depth + 1)
+    return [ fn, source ]
+
+def groff(device, source):
+    cmd= [ "groff", "-T%s" % device, "-k", "-mandoc", "-t", "-s", "-rHY=0" ]
+    if source.startswith(b"'\\\" "):
+        for x in source[4:source.find(b"\n")].decode("utf-8", "replace").strip():
+            if x in "eEpPgGrR":
+                cmd.append("-%s" % x.lower().replace("r", "R"))
+    return cmd
+
+TBLBLOCK, TBLMARK= compile(rb"^[.'][ \t]*TS\b[^\n]*\n(.*?)^[.'][ \t]*TE\b[^\n]*(?:\n|$)", DOTALL|MULTILINE), compile(r"manpagesguitable(\d+)(?:<br>)?")
+TBLINLINE= compile(r"\\(?:f(?:\[([^]\n]*)\]|\((..)|(.))|\[([^]\n]*)\]|\((..)|\*(?:\[([^]\n]*)\]|\((..)|(.))|s(?:\([+-]?\d\d|\[[^]\n]*\]|[+-]?\d+)|(.))")
+TBLCHARS= { "em": "—", "en": "–", "hy": "-", "mi": "−", "pl": "+", "mu": "×", "bu": "•", "co": "©", "rg": "®", "tm": "™", "de": "°", "lq": "“", "rq": "”", "oq": "‘", "cq": "’", "aq": "'", "dq": "\"", "ti": "~", "ha": "^", "rs": "\\", "ba": "|", "<=": "≤", ">=": "≥", "!=": "≠", "->": "→", "<-": "←", "ra": "→", "la": "←", "Tm": "™", "R": "®", "-": "-", "e": "\\", "\\": "\\", " ": " ", "~": " ", "0": " ", "'": "'", "`": "`", ".": "." }
+TBLFONTS= { "B": "b", "3": "b", "BI": "b", "CB": "b", "I": "i", "2": "i", "CI": "i" }
+
+def tblText(text, font= ""):
+    html, start= [ "<%s>" % font if font else "" ], 0
+    for x in TBLINLINE.finditer(text):
+        html.append(htmlEscape(text[start:x.start()], False))
+        start= x.end()
+        if x.group(1) or x.group(2) or x.group(3):
+            new= TBLFONTS.get(x.group(1) or x.group(2) or x.group(3), "")
+            if new != font:
+                html.append("%s%s" % ("</%s>" % font if font else "", "<%s>" % new if new else ""))
+                font= new
+        else:
+            name= next((y for y in x.groups()[3:] if y is not None), "")
+            html.append(htmlEscape(chr(int(name[1:], 16)) if match(r"u[0-9A-F]{4,6}$", name) else TBLCHARS.get(name, ""), False))
+    html.append("%s%s" % (htmlEscape(text[start:], False), "</%s>" % font if font else ""))
+    return [ "".join(html), font ]
+
+def tblFormat(lines, i):
+    formats= list()
+    while i < len(lines):
+        line, i= lines[i].strip(), i + 1
+        for row in line.rstrip(".").split(","):
+            specs, j= list(), 0
+            while j < len(row):
+                c= row[j]
+                if c in "lrcnasLRCNAS^_=-":
+                    specs.append([ c.lower(), "" ])
+                elif len(specs) and c in "bBiI":
+                    specs[-1][1]= c.lower()
+                elif len(specs) and c in "fF":
+                    name= row[j + 2:j + 4] if row[j + 1:j + 2] == "(" else row[j + 2:row.find("]", j)] if row[j + 1:j + 2] == "[" else row[j + 1:j + 2]
+                    specs[-1][1]= TBLFONTS.get(name, "")
+                    j+= len(name) + (2 if row[j + 1:j + 2] in "([" else 0)
+                elif c in "wW" and row[j + 1:j + 2] == "(":
+                    j= row.find(")", j) if row.find(")", j) > -1 else len(row)
+                j+= 1
+            if len(specs):
+                formats.append(specs)
+        if line.endswith("."):
+            break
+    return [ formats if len(formats) else [ [ [ "l", "" ] ] ], i ]
+
+def tblBlock(lines, font):
+    html, segment= list(), list()
+    for line in lines + [ ".br" ]:
+        if line[:1] not in ".'":
+            segment.append(line)
+        elif match(r"[.'][ \t]*(?:br|sp)\b", line) and len(segment):
+            text, font= tblText(" ".join(segment), font)
+            html.append(text)
+            segment= list()
+    return [ "<br>".join(html), font ]
+
+def tblTable(block):
+    lines, tab, i= block.splitlines(), "\t", 0
+    if len(lines) and lines[0].rstrip().endswith(";"):
+        options= match(r".*\btab\s*\((.)\)", lines[0])
+        tab, i= options.group(1) if options else tab, 1
+    formats, i= tblFormat(lines, i)
+    rows, origin, n= list(), dict(), 0
+    while i < len(lines):
+        rest, i= lines[i], i + 1
+        if rest.startswith(".T&"):
+            (formats, i), n= tblFormat(lines, i), 0
+            continue
+        elif rest[:1] in ".'" or rest.strip() in [ "_", "=" ]:
+            continue
+        cells, font= list(), ""
+        while rest is not None:
+            if rest.startswith("T{"):
+                text= [ rest[2:] ] if len(rest[2:].strip()) else list()
+                while i < len(lines) and not lines[i].startswith("T}"):
+                    text.append(lines[i])
+                    i+= 1
+                rest, i= lines[i][2:] if i < len(lines) else "", i + 1
+                html, font= tblBlock(text, font)
+                cells.append([ None, html ])
+                rest= rest[len(tab):] if rest.startswith(tab) else None
+            else:
+                text, found, rest= rest.partition(tab)
+                html, font= tblText(text, font)
+                cells.append([ text, html ])
+                rest= rest if found else None
+        specs, row, n= formats[min(n, len(formats) - 1)], list(), n + 1
+        for c, (text, html) in enumerate((cells + [ [ "", "" ] ] * len(specs))[:max(len(specs), len(cells))]):
+            key, bold= specs[c] if c < len(specs) else [ "l", "" ]
+            if key == "s" and len(row):
+                row[-1][2]+= 1
+                origin[c]= row[-1]
+            elif (key == "^" or text == "\\^") and c in origin:
+                if origin[c][4] != len(rows):
+                    origin[c][3], origin[c][4]= origin[c][3] + 1, len(rows)
+            else:
+                origin[c]= [ "" if key in "_=-^" or text in [ "_", "=", "\\_", "\\^" ] else html, bold, 1, 1, len(rows), key ]
+                row.append(origin[c])
+        rows.append(row)
+    table= [ "<table class='add'>" ]
+    for r, row in enumerate(rows):
+        table.append("<tr>")
+        for html, bold, cols, span, last, key in row:
+            tag= "th" if r == 0 else "td"
+            table.append("<%s class='add'%s%s%s>%s%s%s</%s>" % (tag, " colspan='%d'" % cols if cols > 1 else "", " rowspan='%d'" % span if span > 1 else "", " align='right'" if key in "rn" else " align='center'" if key == "c" else "", "<%s>" % bold if bold else "", html, "</%s>" % bold if bold else "", tag))
+        table.append("</tr>")
+    table.append("</table>")
+    return "".join(table)
+
+def tblTables(source):
+    tables, parts, start= list(), list(), 0
+    for x in TBLBLOCK.finditer(source):
+        parts.extend([ source[start:x.start()], b".br\nmanpagesguitable%d\n.br\n" % len(tables) ])
+        tables.append(tblTable(x.group(1).decode("utf-8", "replace")))
+        start= x.end()
+    return [ b"".join(parts) + source[start:] if len(tables) else source, tables ]
+
+HEADPROCESS= [ [ compile(r"(?<=<body>)[\S \n]+?(?=<h2>)"), r"\n" ], [ compile(r"^[\S \n]+(<style)"), r"<html><head><meta charset='utf-8'>\1" ], [ compile(r"(<style type=\"text/css\">)[\S \n]*(</style>)"), r"\1\2" ] ]
+STYLE, IMGTABLE= compile(r"(<style type=\"text/css\">)(</style>)"), compile(r"<img src=\"grohtml-[^>]*>")
+MANPAGEHREF= compile(r"<a href='%s:([^'\s]+)\.([^.'\s]+)'>" % ManPagesGUI.manScheme)
+MANPAGEANCHOR= compile(r"<a href='%s:([^'\s]+)\.([^.'\s]+)'>([^<]*)</a>" % ManPagesGUI.manScheme)
+SECTIONSTART, SECTIONCHUNK= compile(r"<h2>"), 64 * 1024
+ANCHORLINE, MANPAGELINK, ENVAR= compile(r"\n<a name.+?\n", DOTALL), compile(r"<b>([_A-Z.0-9-]+)</b>\((\d+[A-Z]*)\)", IGNORECASE), compile(r"\$[A-Z_.]+")
+URLLINK, EMAILDOMAIN, EMAILLOCAL= compile(r"https?://(?=([\dA-Z.-]+?\.[A-Z.-](?=[A-Z.-])))\1(?=\.*[/\w&\-−;])[/\w&\-.−;]*(?<!\.)", IGNORECASE), compile(r"@[_A-Z0-9-]+\.[A-Z0-9.-]+", IGNORECASE), frozenset("_.+-0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZİıſK")
+
+def linkEmails(html, start= 0, end= 0):
+    links= list()
+    for domain in EMAILDOMAIN.finditer(html):
+        i= domain.start()
+        while i > end and html[i - 1] in EMAILLOCAL:
+            i-= 1
+        if i < domain.start():
+            links.extend([ html[start:i], "<a href='mailto://%s'>%s</a>" % (html[i:domain.end()], html[i:domain.end()]) ])
+            start= end= domain.end()
+    return "%s%s" % ("".join(links), html[start:])
+
+def postProcess(html):
+    i= html.find("<h2>")
+    head, html= [ html, "" ] if i == -1 else [ html[:i + 4], html[i + 4:] ]
+    for pattern, replacement in HEADPROCESS:
+        head= pattern.sub(replacement, head, 1)
+    html= ENVAR.sub(r"<envar>\g<0></envar>", MANPAGELINK.sub(r"<a href='%s:\1.\2'>\1(\2)</a>" % ManPagesGUI.manScheme, ANCHORLINE.sub("", head + html)))
+    if not namespace.no_url_link:
+        html= URLLINK.sub(r"<a href='\g<0>'>\g<0></a>", html)
+    if not namespace.no_email_link:
+        html= linkEmails(html)
+    return html.replace("<hr>", "").replace("\n\n\n", "\n").replace("\n\n", "\n")
+
+def styleSheet():
+    return dedent("%s%s" % ("" if namespace.theme_color else """
+        body { color: """ + namespace.color + """; background-color: """ + namespace.background + """ }
+        a:link { color: """ + namespace.link_color + """; background-color: """ + namespace.link_background + """ }
+        h2 { color: """ + namespace.section_color + """; background-color: """ + namespace.section_background + """}
+        envar { color: """ + namespace.envar_color + """; background-color: """ + namespace.envar_background + """}
+        b { color: """ + namespace.bold_color + """; background-color: """ + namespace.bold_background + """}
+        i { color: """ + namespace.italic_color + """; background-color: """ + namespace.italic_background + """}
+        table.add { border-collapse: collapse; margin: 1em auto; }
+        td.add, th.add { border: 1px solid """ + namespace.color + """; padding: 3px; }\n""", """
+        p, pre, table { margin-top: 0; margin-bottom: 0; vertical-align: top }"""))
+
+def pageSections(html, size):
+    end= html.rfind("</body>")
+    end, cuts, previous= len(html) if end == -1 else end, [ 0 ], 0
+    for x in [ x.start() for x in SECTIONSTART.finditer(html, 0, end) ][1:] + [ end ]:
+        if x - cuts[-1] > size and previous > cuts[-1]:
+            cuts.append(previous)
+        previous= x
+    cuts.append(end)
+    return [ html[:cuts[1]] + html[end:], [ html[x:y] for x, y in zip(cuts[1:], cuts[2:]) ] ]
+
+def styledPage(html, css):
+    return STYLE.sub(lambda x: "%s%s%s" % (x.group(1), css, x.group(2)), html, 1)
+
+def render(page, cmd, job= None):
+    raw, start, tables= readSource(page), time(), list()
+    if raw is None:
+        source= man(cmd + [ "-Hcat", "--nh", "-l", page ], ManPagesGUI.POPEN, job= job)
+    else:
+        (raw[1], tables), cwd= tblTables(raw[1]), path.dirname(path.dirname(raw[0]))
+        if job and len(tables):
+            job.timed("tables", start)
+        start= time()
+        source= man(groff("html", raw[1]), ManPagesGUI.POPEN, job= job, Input= raw[1], cwd= cwd)
+    if job:
+        job.timed("groff", start)
+    if source[0] == 0:
+        start= time()
+        html= postProcess(TBLMARK.sub(lambda x: tables[int(x.group(1))] if int(x.group(1)) < len(tables) else x.group(0), source[1]) if len(tables) else IMGTABLE.sub("<table class='add'><tr><td class='add'>%s</td></tr></table>" % gettext("Table not available for this page"), source[1]))
+        if job:
+            job.timed("postprocess", start)
+        return [ html ]
+
+class ProcessBroker:
+
+    class Call:
+
+        def __init__(self, key, cmd):
+            self.key, self.cmd, self.proc, self.result, self.waiters, self.left, self.done= key, cmd, None, None, 1, set(), Event()
+
+    def __init__(self, limit):
+        self.slots, self.lock, self.calls, self.counters= BoundedSemaphore(limit), Lock(), dict(), OrderedDict((x, 0) for x in [ "spawned", "reused", "killed", "timeouts" ])
+
+    def run(self, cmd, Tout= 20, job= None, Input= None, cwd= None):
+        cmd= [ "nice", "-n", "19" ] + cmd if job and job.nice else cmd
+        key= (tuple(cmd), Input, cwd)
+        with self.lock:
+            call= self.calls.get(key)
+            if call is None:
+                call= self.calls[key]= self.Call(key, cmd)
+                owner= True
+            else:
+                call.waiters, owner= call.waiters + 1, False
+                self.counters["reused"]+= 1
+        if job:
+            job.register(call)
+        if owner:
+            self.execute(call, Tout, Input, cwd)
+        while not call.done.wait(0.1):
+            if job and job.cancelled:
+                return None
+        return call.result
+
+    def execute(self, call, Tout, Input, cwd):
+        try:
+            while not self.slots.acquire(timeout= 0.1):
+                if not call.waiters:
+                    return
+            try:
+                if not call.waiters:
+                    return
+                call.proc= Popen(call.cmd, stdin= DEVNULL if Input is None else PIPE, stdout= PIPE, stderr= DEVNULL, cwd= cwd, start_new_session= True)
+                with self.lock:
+                    self.counters["spawned"]+= 1
+                if not call.waiters:
+                    self.kill(call)
+                try:
+                    source= call.proc.communicate(Input, timeout= Tout)[0]
+                except TimeoutExpired:
+                    with self.lock:
+                        self.counters["timeouts"]+= 1
+                    self.kill(call, True)
+                else:
+                    call.result= [ call.proc.returncode, source.decode("utf-8", "replace") ]
+            except:
+                if call.proc is not None:
+                    self.kill(call, True)
+            finally:
+                self.slots.release()
+        finally:
+            with self.lock:
+                if self.calls.get(call.key) is call:
+                    self.calls.pop(call.key)
+            call.done.set()
+
+    def kill(self, call, wait= False):
+        if call.proc.poll() is None:
+            try:
+                killpg(call.proc.pid, SIGTERM)
+            except OSError:
+                return
+            with self.lock:
+                self.counters["killed"]+= 1
+        if wait:
+            try:
+                call.proc.communicate(timeout= 1)
+            except TimeoutExpired:
+                try:
+                    killpg(call.proc.pid, SIGKILL)
+                except OSError:
+                    pass
+                call.proc.communicate()
+
+    def cancel(self, call, job):
+        with self.lock:
+            if job in call.left:
+                return
+            call.left.add(job)
+            call.waiters-= 1
+            if not call.waiters and self.calls.get(call.key) is call:
+                self.calls.pop(call.key)
+        if not call.waiters and call.proc is not None:
+            self.kill(call)
+
+broker= ProcessBroker(max(cpu_count(), 2))
+
+def man(page, option, Tout= 20, job= None, Input= None, cwd= None):
+    cmd= [ namespace.man_command, "-D" ] + ([ "-M%s" % namespace.man_directory ] if namespace.man_directory else list()) + ([ "-Len" ] if namespace.no_locale else list())
+    if option == ManPagesGUI.POPEN:
+        source= broker.run(page, Tout, job, Input, cwd)
+        if source is not None:
+            return source
+    elif option == ManPagesGUI.DEFAULTSECTION:
+        section, page= page.split(" ", 1) if " " in page else [ None, page ]
+        source= man(cmd + [ "-aw", page ], ManPagesGUI.POPEN, job= job)
+        if source[0] == 0:
+            found= [ [ pageLabel(fn), fn ] for fn in source[1].splitlines() if len(fn) ]
+            default= [ x for x in found if section is None or x[0][x[0].rfind("(") + 1:].lower().startswith(section.lower()) ]
+            if len(default):
+                return [ default[0] ] + [ x for x in found if x != default[0] ]
+            return [ -1 ]
+        elif source[0] == 16:
+            return [ -1 ]
+    elif option == ManPagesGUI.CONTENTSECTION:
+        start= time()
+        source= cache.get(page) if cache else None
+        if job and cache:
+            job.timed("cache", start)
+        if source is None:
+            source= render(page, cmd, job)
+            if cache and source is not None:
+                cache.set(page, source)
+        if source is not None:
+            return source
+    elif option in [ ManPagesGUI.FINDSHORT, ManPagesGUI.FINDREGEX|ManPagesGUI.FINDSHORT ]:
+        addOption, Tout= [ [ "-k" ], 25 ] if option == ManPagesGUI.FINDSHORT else [ [ "-k", "--regex" ], 25 * 2 ]
+        source= man(cmd + addOption + [ page ], ManPagesGUI.POPEN, Tout)
+        if source[0] == 0:
+            return source[1].splitlines()
+        elif source[0] == 16:
+            return [ -1 ]
+    return [ -2 ]
+
+def poolInit(options, links= None):
+    global namespace, cache, exportLinks
+    namespace, cache, exportLinks= options, RenderCache(int(options.cache_size)) if int(options.cache_size) else None, links
+
+def exportLink(x, target):
+    candidates= exportLinks.get(x.group(1).lower(), list())
+    found= [ y for z, y in candidates if z == x.group(2).lower() ] + [ y for z, y in candidates if z.startswith(x.group(2).lower()) ]
+    return "<a href='%s'>%s</a>" % (path.relpath(found[0], path.dirname(target)), x.group(3)) if len(found) else "<b>%s</b>(%s)" % (x.group(1), x.group(2))
+
+def exportPages(pages):
+    written, failed= 0, list()
+    for fn, target, mtime in pages:
+        source= man(fn, ManPagesGUI.CONTENTSECTION)
+        if type(source[0]) != type(str()):
+            failed.append(fn)
+            continue
+        html= MANPAGEANCHOR.sub(lambda x: exportLink(x, target), styledPage(source[0], styleSheet()))
+        try:
+            fd, tmp= mkstemp(dir= path.dirname(target), prefix= ".")
+            with fdopen(fd, "w", encoding= "utf-8") as f:
+                f.write(html)
+            utime(tmp, ns= (mtime, mtime))
+            replace(tmp, target)
+        except:
+            failed.append(fn)
+        else:
+            written+= 1
+    return [ written, failed ]
+
+def export(directory, pages, roots):
+    files, targets, links, work, done, written, failed, start= manFiles(roots), set(), dict(), list(), 0, 0, list(), time()
+    for fn, mtime in files.items():
+        if len(pages) and not any(pageMatches(pageLabel(fn), x) for x in pages):
+            continue
+        root= [ x for x in roots if fn.startswith(x + sep) ][0]
+        target= path.join(directory, sub(r"\.(%s)$" % "|".join(x[1:] for x in COMPRESSIONS), "", path.relpath(fn, root)) + ".html")
+        if target in targets:
+            continue
+        targets.add(target)
+        label= pageLabel(fn).lower()
+        links.setdefault(label[:label.rfind("(")], list()).append([ label[label.rfind("(") + 1:-1], target ])
+        try:
+            if stat(target).st_mtime_ns == mtime:
+                continue
+        except:
+            pass
+        makedirs(path.dirname(target), exist_ok= True)
+        work.append([ fn, target, mtime ])
+    print("%s: %d, %s: %d" % (gettext("Pages"), len(targets), gettext("up to date"), len(targets) - len(work)), flush= True)
+    with ProcessPoolExecutor(max_workers= cpu_count(), mp_context= get_context("spawn"), initializer= poolInit, initargs= (namespace, links)) as pool:
+        for job in as_completed([ pool.submit(exportPages, work[i:i + 16]) for i in range(0, len(work), 16) ]):
+            done, written, failed= done + sum(job.result()[:1]) + len(job.result()[1]), written + job.result()[0], failed + job.result()[1]
+            print("\r%s: %d/%d (%.1f %s)" % (gettext("Exported pages"), done, len(work), written / max(time() - start, 0.001), gettext("pages/s")), end= "", flush= True)
+    print("\n%s: %d, %s: %d, %.1f s" % (gettext("Exported pages"), written, gettext("Errors"), len(failed), time() - start))
+    for fn in failed:
+        print("%s: %s" % (fn, ManPagesGUI.errorOccurred))
+    return 1 if len(failed) else 0
+
 if __name__ == "__main__":
     namespace, extra= parsing()
+    if namespace.single_instance and not namespace.export and not namespace.update_index and not namespace.startup_time and forwardPages(parsePages(extra), int(namespace.random_page)):
+        exit(0)
+    cache= RenderCache(int(namespace.cache_size)) if int(namespace.cache_size) or namespace.clear_cache else None
+    if namespace.clear_cache:
+        cache.clear()
+        cache= cache if int(namespace.cache_size) else None
+    index, whatis, profiler= FullTextIndex(), WhatisIndex(), Profiler(namespace.profile)
+    catalog, graph= Catalog(), LinkGraph()
+    if namespace.export:
+        exit(export(namespace.export, parsePages(extra), manRoots()))
+    if namespace.update_index:
+        exit(0 if index.update(lambda done, total: print("\r%s: %d/%d" % (gettext("Indexed pages"), done, total), end= "" if done < total else "\n", flush= True)) and catalog.load() and graph.update() else 1)
     app, ui= QApplication(extra), ManPagesGUI()
     if int(namespace.random_page):
         ui.manpages.openPage(None, int(namespace.random_page))
     ui.manpages.openPage(parsePages(extra), False)
     ManPagesGUI.self.command.setFocus()
     ui.show()
+    if namespace.startup_time and not int(namespace.random_page) and not len(parsePages(extra)):
+        QTimer.singleShot(0, ui.started)
     exit(app.exec_())